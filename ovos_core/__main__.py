@@ -17,10 +17,19 @@
 The executable gets added to the bin directory when installed
 (see setup.py)
 """
+import os
+import sys
+
+from ovos_core.startup_profiler import MAX_PROFILE_DURATION, profile_dir_from_argv, profiler
+
+if profile_dir_from_argv(sys.argv) is not None:
+    # ovos-core --profile-startup, start before the imports below, they are part of the boot time
+    profiler.start(max_duration=MAX_PROFILE_DURATION)
 
 from ovos_bus_client import MessageBusClient
 from ovos_config.locale import setup_locale
 from ovos_utils import wait_for_exit_signal
+from ovos_config.locations import get_xdg_cache_save_path
 from ovos_utils.log import LOG, init_service_logger
 
 from ovos_core.skill_manager import SkillManager, on_error, on_stopping, on_ready, on_alive, on_started
@@ -32,40 +41,81 @@ def main(alive_hook=on_alive, started_hook=on_started, ready_hook=on_ready,
          enable_skill_api=True,
          enable_intent_service=True,
          enable_installer=True,
-         enable_event_scheduler=True):
+         enable_event_scheduler=True,
+         profile_startup=None):
     """Create a thread that monitors the loaded skills, looking for updates
 
+    Args:
+        profile_startup (str): directory to save the boot timeline to once ovos-core is ready,
+            read from --profile-startup [DIR] if not given (the console script calls main() without arguments)
+
     Returns:
         SkillManager instance or None if it couldn't be initialized
     """
-    init_service_logger("skills")
+    if profile_startup is None:
+        profile_startup = profile_dir_from_argv(sys.argv)
+        if profile_startup == "":  # flag without DIR
+            profile_startup = get_default_profile_dir()
+    if profile_startup:
+        if not profiler.enabled:
+            profiler.start(max_duration=MAX_PROFILE_DURATION)
+        ready_hook = _profiled_ready_hook(ready_hook, profile_startup)
+
+    try:
+        with profiler.span("init_service_logger"):
+            init_service_logger("skills")
+
+        with profiler.span("setup_locale"):
+            setup_locale()
+
+        # Connect this process to the OpenVoiceOS message bus
+        with profiler.span("bus_connect"):
+            bus = MessageBusClient()
+            bus.run_in_thread()
+            bus.connected_event.wait()
+
+        with profiler.span("SkillManager.__init__"):
+            skill_manager = SkillManager(bus, watchdog,
+                                         enable_file_watcher=enable_file_watcher,
+                                         enable_skill_api=enable_skill_api,
+                                         enable_intent_service=enable_intent_service,
+                                         enable_installer=enable_installer,
+                                         enable_event_scheduler=enable_event_scheduler,
+                                         alive_hook=alive_hook,
+                                         started_hook=started_hook,
+                                         stopping_hook=stopping_hook,
+                                         ready_hook=ready_hook,
+                                         error_hook=error_hook)
+
+        skill_manager.start()
+
+        wait_for_exit_signal()
+
+        skill_manager.shutdown()
+    finally:
+        profiler.stop()  # in case ovos-core never became ready
 
-    setup_locale()
+    LOG.info('Skills service shutdown complete!')
 
-    # Connect this process to the OpenVoiceOS message bus
-    bus = MessageBusClient()
-    bus.run_in_thread()
-    bus.connected_event.wait()
 
-    skill_manager = SkillManager(bus, watchdog,
-                                 enable_file_watcher=enable_file_watcher,
-                                 enable_skill_api=enable_skill_api,
-                                 enable_intent_service=enable_intent_service,
-                                 enable_installer=enable_installer,
-                                 enable_event_scheduler=enable_event_scheduler,
-                                 alive_hook=alive_hook,
-                                 started_hook=started_hook,
-                                 stopping_hook=stopping_hook,
-                                 ready_hook=ready_hook,
-                                 error_hook=error_hook)
+def get_default_profile_dir():
+    """default directory for --profile-startup reports"""
+    return os.path.join(get_xdg_cache_save_path(), "startup_profile")
 
-    skill_manager.start()
 
-    wait_for_exit_signal()
+def _profiled_ready_hook(ready_hook, directory):
+    """wrap the ready hook, the boot timeline ends when ovos-core is ready"""
 
-    skill_manager.shutdown()
+    def on_ready_profiled():
+        profiler.stop()
+        try:
+            paths = profiler.save(directory)
+            LOG.info(f"ovos-core booted in {profiler.report()['total']:.2f}s, startup profile saved to {paths}")
+        except Exception:
+            LOG.exception("Failed to save startup profile")
+        ready_hook()
 
-    LOG.info('Skills service shutdown complete!')
+    return on_ready_profiled
 
 
 if __name__ == "__main__":
@@ -83,6 +133,10 @@ if __name__ == "__main__":
                         help="Disable skill installer")
     parser.add_argument("--disable-event-scheduler", action="store_false", dest="enable_event_scheduler",
                         help="Disable the bus event scheduler")
+    parser.add_argument("--profile-startup", nargs="?", const=get_default_profile_dir(), default=None,
+                        metavar="DIR", dest="profile_startup",
+                        help="Save a boot timeline (json report and Chrome trace-event file) to DIR "
+                             "once ovos-core is ready")
 
     args = parser.parse_args()
 
@@ -90,4 +144,5 @@ if __name__ == "__main__":
          enable_skill_api=args.enable_skill_api,
          enable_intent_service=args.enable_intent_service,
          enable_installer=args.enable_installer,
-         enable_event_scheduler=args.enable_event_scheduler)
+         enable_event_scheduler=args.enable_event_scheduler,
+         profile_startup=args.profile_startup)
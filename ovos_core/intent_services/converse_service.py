@@ -1,5 +1,5 @@
 import time
-from threading import Event
+from threading import Timer
 from typing import Optional, Dict, List, Union
 
 from ovos_bus_client.client import MessageBusClient
@@ -8,12 +8,15 @@ from ovos_bus_client.session import SessionManager, UtteranceState, Session
 from ovos_config.config import Configuration
 from ovos_utils import flatten_list
 from ovos_utils.fakebus import FakeBus
-from ovos_utils.lang import standardize_lang_tag
 from ovos_utils.log import LOG
 
 from ovos_plugin_manager.templates.pipeline import PipelinePlugin, IntentHandlerMatch
 from ovos_workshop.permissions import ConverseMode, ConverseActivationMode
 
+from ovos_core.intent_services.lang import standardize_lang
+from ovos_core.intent_services.ping_pong import LatencyTracker, PendingPing, PingPongMultiplexer, \
+    UnresponsiveCache
+
 
 class ConverseService(PipelinePlugin):
     """Intent Service handling conversational skills."""
@@ -23,12 +26,18 @@ class ConverseService(PipelinePlugin):
         config = config or Configuration().get("skills", {}).get("converse", {})
         super().__init__(bus, config)
         self._consecutive_activations = {}
+        self.pings = PingPongMultiplexer(self.bus, on_late_pong=self._handle_late_pong)
+        self.unresponsive = UnresponsiveCache(self.bus, ttl=self.config.get("unresponsive_cache_ttl", 30))
+        self.latencies = LatencyTracker(max_timeout=self.config.get("ping_timeout", 0.5),
+                                        min_timeout=self.config.get("min_ping_timeout", 0.1),
+                                        factor=self.config.get("ping_timeout_factor", 2.0))
         self.bus.on('intent.service.skills.deactivate', self.handle_deactivate_skill_request)
         self.bus.on('intent.service.skills.activate', self.handle_activate_skill_request)
         self.bus.on('intent.service.active_skills.get', self.handle_get_active_skills)
         self.bus.on("skill.converse.get_response.enable", self.handle_get_response_enable)
         self.bus.on("skill.converse.get_response.disable", self.handle_get_response_disable)
         self.bus.on("converse:skill", self.handle_converse)
+        self.bus.on("intent.service.converse.stats.get", self.handle_get_converse_stats)
 
     def handle_converse(self, message: Message):
         skill_id = message.data["skill_id"]
@@ -215,56 +224,98 @@ class ConverseService(PipelinePlugin):
     def _collect_converse_skills(self, message: Message) -> List[str]:
         """use the messagebus api to determine which skills want to converse
 
-        Individual skills respond to this request via the `can_converse` method"""
-        skill_ids = []
-        want_converse = []
+        Individual skills respond to this request via the `can_converse` method
+
+        Each skill gets an adaptive deadline based on its past response times,
+        collection ends as soon as the highest priority skill that wants to converse
+        has answered, lower priority skills don't matter at that point
+
+        Skills that did not answer within the full "ping_timeout" are not pinged again
+        in this session until they are re-activated, change utterance state, get reloaded
+        or a late answer arrives. Missing the adaptive deadline only ends collection early,
+        the ping stays open in the background until "ping_timeout" to tell slow skills from dead ones
+
+        Returns:
+            want_converse (list): skill_ids that want to converse, ordered by priority
+        """
         session = SessionManager.get(message)
 
         # note: this is sorted by priority already
         active_skills = [skill_id for skill_id in self.get_active_skills(message)
-                     if session.utterance_states.get(skill_id, UtteranceState.INTENT) == UtteranceState.INTENT]
+                         if session.utterance_states.get(skill_id, UtteranceState.INTENT) == UtteranceState.INTENT
+                         and skill_id not in session.blacklisted_skills
+                         and self._converse_allowed(skill_id)
+                         # skills that recently didn't answer would only make us wait for the full timeout again
+                         and not self.unresponsive.is_unresponsive(session, skill_id)]
         if not active_skills:
-            return want_converse
-
-        event = Event()
-
-        def handle_ack(msg):
-            nonlocal event
-            skill_id = msg.data["skill_id"]
-
-            # validate the converse pong
-            if all((skill_id not in want_converse,
-                    msg.data.get("can_handle", True),
-                    skill_id in active_skills)):
-                want_converse.append(skill_id)
+            return []
 
-            if skill_id not in skill_ids:  # track which answer we got
-                skill_ids.append(skill_id)
-
-            if all(s in skill_ids for s in active_skills):
-                # all skills answered the ping!
-                event.set()
-
-        self.bus.on("skill.converse.pong", handle_ack)
+        deadlines = {skill_id: self.latencies.deadline(skill_id) for skill_id in active_skills}
+        ping = self.pings.open("skill.converse.pong", session.session_id, active_skills)
 
         # ask skills if they want to converse
         for skill_id in active_skills:
-            self.bus.emit(message.forward(f"{skill_id}.converse.ping", {**message.data, "skill_id": skill_id}))
-
-        # wait for all skills to acknowledge they want to converse
-        event.wait(timeout=0.5)
+            self.bus.emit(Message(f"{skill_id}.converse.ping", {**message.data, "skill_id": skill_id},
+                                  ping.context(message)))
+
+        # wait until the highest priority skill that wants to converse answers
+        with ping.cond:
+            while True:
+                elapsed = time.monotonic() - ping.start
+                pending = None
+                for skill_id in active_skills:
+                    if skill_id in ping.answers:
+                        if ping.answers[skill_id]:
+                            break  # best candidate found, no need to wait for lower priority skills
+                        continue
+                    if deadlines[skill_id] > elapsed:
+                        pending = skill_id  # higher priority skill still has time to answer
+                        break
+                if pending is None:
+                    break
+                ping.cond.wait(deadlines[pending] - elapsed)
+            answers = dict(ping.answers)
+
+        for skill_id in answers:
+            self.latencies.record(skill_id, ping.latencies[skill_id])
+        missing = [skill_id for skill_id in active_skills if skill_id not in answers]
+        remaining = self.latencies.max_timeout - (time.monotonic() - ping.start)
+        if missing and remaining > 0:
+            # keep listening for the skills we stopped waiting for
+            timer = Timer(remaining, self._close_ping, (ping, session, missing))
+            timer.daemon = True
+            timer.start()
+        else:
+            self._close_ping(ping, session, missing)
+        return [skill_id for skill_id in active_skills if answers.get(skill_id)]
+
+    def _close_ping(self, ping: PendingPing, session: Session, skill_ids: List[str]):
+        """stop collecting answers, skills that did not answer within "ping_timeout" are cached as unresponsive"""
+        self.pings.close(ping)
+        with ping.cond:
+            latencies = dict(ping.latencies)
+        for skill_id in skill_ids:
+            if skill_id in latencies:  # slower than its adaptive deadline, but alive
+                self.latencies.record(skill_id, latencies[skill_id])
+                continue
+            LOG.debug(f"{skill_id} did not answer converse ping within {self.latencies.max_timeout:.3f}s")
+            self.latencies.record_timeout(skill_id)
+            self.unresponsive.add(session, skill_id)
 
-        self.bus.remove("skill.converse.pong", handle_ack)
-        return want_converse
+    def _handle_late_pong(self, session_id: str, skill_id: str):
+        """the skill answered after its ping was closed, it is alive after all"""
+        self.unresponsive.invalidate(session_id=session_id, skill_id=skill_id)
 
     def _check_converse_timeout(self, message: Message):
         """ filter active skill list based on timestamps """
         timeouts = self.config.get("skill_timeouts") or {}
         def_timeout = self.config.get("timeout", 300)
         session = SessionManager.get(message)
-        session.active_skills = [
-            skill for skill in session.active_skills
-            if time.time() - skill[1] <= timeouts.get(skill[0], def_timeout)]
+        now = time.time()
+        active_skills = [skill for skill in session.active_skills
+                         if now - skill[1] <= timeouts.get(skill[0], def_timeout)]
+        if len(active_skills) != len(session.active_skills):  # only replaced if something expired
+            session.active_skills = active_skills
 
     def match(self, utterances: List[str], lang: str, message: Message) -> Optional[IntentHandlerMatch]:
         """
@@ -291,7 +342,7 @@ class ConverseService(PipelinePlugin):
             - Checks for skill conversation timeouts
             - Attempts conversation with each eligible skill
         """
-        lang = standardize_lang_tag(lang)
+        lang = standardize_lang(lang)
         session = SessionManager.get(message)
 
         # we call flatten in case someone is sending the old style list of tuples
@@ -384,8 +435,20 @@ class ConverseService(PipelinePlugin):
         self.bus.emit(message.reply("intent.service.active_skills.reply",
                                     {"skills": self.get_active_skills(message)}))
 
+    def handle_get_converse_stats(self, message: Message):
+        """Send converse ping response time statistics to caller.
+
+        Argument:
+            message: query message to reply to.
+        """
+        self.bus.emit(message.reply("intent.service.converse.stats.reply",
+                                    {"skills": self.latencies.stats()}))
+
     def shutdown(self):
+        self.pings.shutdown()
+        self.unresponsive.shutdown()
         self.bus.remove("converse:skill", self.handle_converse)
+        self.bus.remove("intent.service.converse.stats.get", self.handle_get_converse_stats)
         self.bus.remove('intent.service.skills.deactivate', self.handle_deactivate_skill_request)
         self.bus.remove('intent.service.skills.activate', self.handle_activate_skill_request)
         self.bus.remove('intent.service.active_skills.get', self.handle_get_active_skills)
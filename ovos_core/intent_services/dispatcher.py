@@ -0,0 +1,54 @@
+"""worker pool for utterance processing, sharded by session_id"""
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from typing import Callable, Dict
+
+from ovos_utils.log import LOG
+
+
+class SessionDispatcher:
+    """run tasks concurrently across sessions, strictly ordered within a session
+
+    each session has its own queue that is drained by at most one worker at a time,
+    a slow session (eg. waiting for a converse ping) only delays its own utterances
+    """
+
+    def __init__(self, max_workers: int = 8):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                            thread_name_prefix="SessionDispatcher")
+        self._queues: Dict[str, deque] = {}
+        self._lock = Lock()
+
+    def submit(self, session_id: str, func: Callable, *args, **kwargs):
+        """queue func to run after all previously submitted tasks of this session"""
+        with self._lock:
+            queue = self._queues.get(session_id)
+            if queue is not None:  # a worker is already draining this session
+                queue.append((func, args, kwargs))
+                return
+            self._queues[session_id] = deque([(func, args, kwargs)])
+        self._executor.submit(self._drain, session_id)
+
+    def _drain(self, session_id: str):
+        with self._lock:
+            func, args, kwargs = self._queues[session_id].popleft()
+        try:
+            func(*args, **kwargs)
+        except Exception as e:
+            LOG.exception(f"Error processing task for session '{session_id}': {e}")
+        with self._lock:
+            if not self._queues[session_id]:
+                self._queues.pop(session_id)
+                return
+        # requeue instead of looping, sessions with a backlog don't starve the others
+        self._executor.submit(self._drain, session_id)
+
+    @property
+    def pending(self) -> Dict[str, int]:
+        """number of queued tasks per session"""
+        with self._lock:
+            return {sid: len(q) for sid, q in self._queues.items()}
+
+    def shutdown(self, wait: bool = False):
+        self._executor.shutdown(wait=wait, cancel_futures=True)
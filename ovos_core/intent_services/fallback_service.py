@@ -15,6 +15,7 @@
 import operator
 import time
 from collections import namedtuple
+from threading import Lock
 from typing import Optional, Dict, List, Union
 
 from ovos_bus_client.client import MessageBusClient
@@ -24,10 +25,12 @@ from ovos_config import Configuration
 from ovos_plugin_manager.templates.pipeline import ConfidenceMatcherPipeline, IntentHandlerMatch
 from ovos_utils import flatten_list
 from ovos_utils.fakebus import FakeBus
-from ovos_utils.lang import standardize_lang_tag
 from ovos_utils.log import LOG
 from ovos_workshop.permissions import FallbackMode
 
+from ovos_core.intent_services.lang import standardize_lang
+from ovos_core.intent_services.ping_pong import PendingPing, PingPongMultiplexer
+
 FallbackRange = namedtuple('FallbackRange', ['start', 'stop'])
 
 
@@ -41,6 +44,10 @@ class FallbackService(ConfidenceMatcherPipeline):
         self.registered_fallbacks = {}  # skill_id: priority
         self.bus.on("ovos.skills.fallback.register", self.handle_register_fallback)
         self.bus.on("ovos.skills.fallback.deregister", self.handle_deregister_fallback)
+        self.pings = PingPongMultiplexer(self.bus)
+        self._pings = {}  # (session_id, utterances, lang): PendingPing
+        self._pings_lock = Lock()
+        self.bus.on("ovos.utterance.handled", self.handle_utterance_handled)
 
     def handle_register_fallback(self, message: Message):
         skill_id = message.data.get("skill_id")
@@ -81,51 +88,77 @@ class FallbackService(ConfidenceMatcherPipeline):
             return False
         return True
 
+    def handle_utterance_handled(self, message: Message):
+        """utterance is done, drop the cached can_answer results of its session"""
+        session_id = SessionManager.get(message).session_id
+        with self._pings_lock:
+            for key in [k for k in self._pings if k[0] == session_id]:
+                self.pings.close(self._pings.pop(key))
+
+    def _get_fallback_ping(self, message: Message, session_id: str) -> PendingPing:
+        """ping all registered fallback skills once per utterance
+
+        match_high, match_medium and match_low all reuse the same can_answer results,
+        the cache is cleared when 'ovos.utterance.handled' is received"""
+        key = (session_id, tuple(message.data.get("utterances") or []), message.data.get("lang"))
+        ttl = self.config.get("ping_cache_ttl", 10)
+        with self._pings_lock:
+            now = time.monotonic()
+            for k, ping in list(self._pings.items()):
+                if now - ping.start > ttl:  # utterance.handled was never received
+                    self.pings.close(self._pings.pop(k))
+            if key in self._pings:
+                return self._pings[key]
+            ping = self.pings.open("ovos.skills.fallback.pong", session_id, self.registered_fallbacks)
+            self._pings[key] = ping
+
+        LOG.info("checking for FallbackSkill candidates")
+        # wait for all skills to acknowledge they want to answer fallback queries
+        # the ping is shared by all tiers, advertise the union of their ranges
+        data = dict(message.data)
+        data["range"] = (0, 101)
+        self.bus.emit(Message("ovos.skills.fallback.ping", data, ping.context(message)))
+        return ping
+
     def _collect_fallback_skills(self, message: Message,
                                  fb_range: Optional[FallbackRange] = None) -> List[str]:
         """use the messagebus api to determine which skills have registered fallback handlers
 
         Individual skills respond to this request via the `can_answer` method
+
+        Only skills inside the requested range are waited for, collection ends as soon as
+        the best priority candidate has answered that it wants to handle the fallback
+
+        Returns:
+            fallback_skills (list): skill_ids that want to handle fallback, ordered by priority
         """
         if fb_range is None:
             fb_range = FallbackRange(0, 100)
-        skill_ids = []  # skill_ids that already answered to ping
-        fallback_skills = []  # skill_ids that want to handle fallback
 
         sess = SessionManager.get(message)
-        # filter skills outside the fallback_range
-        in_range = [s for s, p in self.registered_fallbacks.items()
+        # filter skills outside the fallback_range, sorted by priority
+        in_range = [s for s, p in sorted(self.registered_fallbacks.items(), key=operator.itemgetter(1))
                     if fb_range.start < p <= fb_range.stop
-                    and s not in sess.blacklisted_skills]
-        skill_ids += [s for s in self.registered_fallbacks if s not in in_range]
-
-        def handle_ack(msg):
-            skill_id = msg.data["skill_id"]
-            if msg.data.get("can_handle", True):
-                if skill_id in in_range:
-                    fallback_skills.append(skill_id)
-                    LOG.info(f"{skill_id} will try to handle fallback")
-                else:
-                    LOG.debug(f"{skill_id} is out of range, skipping")
-            else:
-                LOG.debug(f"{skill_id} does NOT WANT to try to handle fallback")
-            skill_ids.append(skill_id)
-
-        if in_range:  # no need to search if no skills available
-            self.bus.on("ovos.skills.fallback.pong", handle_ack)
-
-            LOG.info("checking for FallbackSkill candidates")
-            message.data["range"] = (fb_range.start, fb_range.stop)
-            # wait for all skills to acknowledge they want to answer fallback queries
-            self.bus.emit(message.forward("ovos.skills.fallback.ping",
-                                          message.data))
-            start = time.time()
-            while not all(s in skill_ids for s in self.registered_fallbacks) \
-                    and time.time() - start <= 0.5:
-                time.sleep(0.02)
-
-            self.bus.remove("ovos.skills.fallback.pong", handle_ack)
-        return fallback_skills
+                    and s not in sess.blacklisted_skills
+                    and self._fallback_allowed(s)]
+        if not in_range:  # no need to search if no skills available
+            return []
+
+        ping = self._get_fallback_ping(message, sess.session_id)
+        in_range = [s for s in in_range if s in ping.skill_ids]  # registered after the ping was sent
+
+        def best_candidate_known() -> bool:
+            for skill_id in in_range:
+                if skill_id not in ping.answers:
+                    return False  # a better candidate may still answer
+                if ping.answers[skill_id]:
+                    return True
+            return True  # everyone answered
+
+        timeout = ping.start + self.config.get("ping_timeout", 0.5) - time.monotonic()
+        ping.wait_for(best_candidate_known, timeout=timeout)
+        with ping.cond:
+            return [s for s in in_range if ping.answers.get(s)]
 
     def _fallback_range(self, utterances: List[str], lang: str,
                         message: Message, fb_range: FallbackRange) -> Optional[IntentHandlerMatch]:
@@ -141,7 +174,7 @@ class FallbackService(ConfidenceMatcherPipeline):
         Returns:
             PipelineMatch or None
         """
-        lang = standardize_lang_tag(lang)
+        lang = standardize_lang(lang)
         # we call flatten in case someone is sending the old style list of tuples
         utterances = flatten_list(utterances)
         message.data["utterances"] = utterances  # all transcripts
@@ -164,7 +197,8 @@ class FallbackService(ConfidenceMatcherPipeline):
                     match_type=f"ovos.skills.fallback.{skill_id}.request",
                     match_data={"skill_id": skill_id,
                                 "utterances": utterances,
-                                "lang": lang},
+                                "lang": lang,
+                                "range": (fb_range.start, fb_range.stop)},
                     utterance=utterances[0],
                     updated_session=sess
                 )
@@ -189,3 +223,5 @@ class FallbackService(ConfidenceMatcherPipeline):
     def shutdown(self):
         self.bus.remove("ovos.skills.fallback.register", self.handle_register_fallback)
         self.bus.remove("ovos.skills.fallback.deregister", self.handle_deregister_fallback)
+        self.pings.shutdown()
+        self.bus.remove("ovos.utterance.handled", self.handle_utterance_handled)
@@ -0,0 +1,29 @@
+"""memoized language tag resolution shared by the intent pipelines
+
+langcodes lookups are slow and the same few tags are resolved on every utterance"""
+from functools import lru_cache
+from typing import Tuple
+
+from langcodes import closest_match
+from ovos_utils.lang import standardize_lang_tag
+
+
+@lru_cache(maxsize=256)
+def standardize_lang(lang: str) -> str:
+    """cached version of ovos_utils.lang.standardize_lang_tag"""
+    return standardize_lang_tag(lang)
+
+
+@lru_cache(maxsize=512)
+def closest_lang(lang: str, candidates: Tuple[str, ...], max_distance: int = 25) -> Tuple[str, int]:
+    """cached version of langcodes.closest_match
+
+    Args:
+        lang: requested language tag
+        candidates: supported language tags, must be a tuple so it can be hashed
+        max_distance: maximum langcodes distance to accept
+
+    Returns:
+        (best_lang, distance), best_lang is "und" if nothing is close enough
+    """
+    return closest_match(lang, list(candidates), max_distance=max_distance)
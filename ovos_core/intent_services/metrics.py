@@ -0,0 +1,185 @@
+"""upload of intent match metrics to user configured open data servers
+
+There isn't a default server to upload things too, users needs to explicitly configure one
+
+https://github.com/OpenVoiceOS/ovos-opendata-server
+"""
+import hashlib
+import json
+import os
+from collections import deque
+from threading import Thread, Condition, Event
+from typing import Dict, List, Optional
+
+import requests
+from ovos_config.config import Configuration
+from ovos_config.locations import get_xdg_data_save_path
+from ovos_utils.log import LOG
+
+
+class IntentMetricsUploader(Thread):
+    """single background uploader for intent match metrics
+
+    - records are queued in a bounded queue, the oldest record is dropped when full
+    - the queue is flushed when `batch_size` records are waiting or every `flush_interval` seconds
+    - a pooled `requests.Session` is kept per endpoint, avoiding a TCP handshake per record
+    - records that could not be delivered are spooled to disk and retried on the next flush
+    - records rejected by the server (4xx) are dropped, records failing with a server error (5xx)
+      are retried up to `max_attempts` times so a single bad record can't block the spool
+
+    configured under "open_data" in mycroft.conf
+
+        "open_data": {
+            "intent_urls": ["http://localhost:8000/intents"],
+            "user_agent": "ovos-metrics",
+            "queue_size": 1000,
+            "batch_size": 20,
+            "flush_interval": 10,
+            "max_spool": 10000,
+            "max_attempts": 5
+        }
+    """
+    # client errors that are worth retrying
+    RETRY_STATUS = (408, 429)
+
+    def __init__(self, config: Optional[dict] = None, spool_dir: Optional[str] = None):
+        super().__init__(daemon=True, name="IntentMetricsUploader")
+        self._config = config
+        self._core_config = Configuration() if config is None else None
+        self.spool_dir = spool_dir or os.path.join(get_xdg_data_save_path(), "intent_metrics")
+        self._queue = deque(maxlen=self.config.get("queue_size", 1000))
+        self._cond = Condition()
+        self._stop_event = Event()
+        self._sessions: Dict[str, requests.Session] = {}
+
+    @property
+    def config(self) -> dict:
+        if self._config is not None:
+            return self._config
+        return self._core_config.get("open_data", {})
+
+    @property
+    def endpoints(self) -> List[str]:
+        endpoints = self.config.get("intent_urls", [])  # eg. "http://localhost:8000/intents"
+        if isinstance(endpoints, str):
+            endpoints = [endpoints]
+        return endpoints
+
+    def submit(self, utterance: str, intent: str, lang: str, match_data: dict):
+        """queue a match record for upload, never blocks"""
+        if not self.endpoints:
+            return  # user didn't configure any endpoints to upload metrics to
+        record = {
+            "utterance": utterance,
+            "intent": intent,
+            "lang": lang,
+            "match_data": json.dumps(match_data, ensure_ascii=False)
+        }
+        with self._cond:
+            if len(self._queue) == self._queue.maxlen:
+                LOG.debug("intent metrics queue full, dropping oldest record")
+            self._queue.append(record)
+            if len(self._queue) >= self.config.get("batch_size", 20):
+                self._cond.notify()
+        if not self.is_alive() and not self._stop_event.is_set():
+            try:
+                self.start()
+            except RuntimeError:
+                pass  # already started by another thread
+
+    def run(self):
+        while not self._stop_event.is_set():
+            with self._cond:
+                self._cond.wait_for(lambda: self._stop_event.is_set() or
+                                            len(self._queue) >= self.config.get("batch_size", 20),
+                                    timeout=self.config.get("flush_interval", 10))
+            self.flush()
+
+    def flush(self):
+        """upload all queued records"""
+        with self._cond:
+            records = list(self._queue)
+            self._queue.clear()
+        for url in self.endpoints:
+            try:
+                self._upload(url, records)
+            except Exception as e:
+                LOG.warning(f"Failed to upload metrics: {e}")
+
+    def _get_session(self, url: str) -> requests.Session:
+        if url not in self._sessions:
+            session = requests.Session()
+            session.headers.update({"Content-Type": "application/x-www-form-urlencoded",
+                                    "User-Agent": self.config.get("user_agent", "ovos-metrics")})
+            self._sessions[url] = session
+        return self._sessions[url]
+
+    def _spool_path(self, url: str) -> str:
+        return os.path.join(self.spool_dir, hashlib.md5(url.encode("utf-8")).hexdigest() + ".jsonl")
+
+    def _read_spool(self, url: str) -> List[dict]:
+        path = self._spool_path(url)
+        if not os.path.isfile(path):
+            return []
+        with open(path, encoding="utf-8") as f:
+            return [json.loads(l) for l in f if l.strip()]
+
+    def _write_spool(self, url: str, records: List[dict]):
+        path = self._spool_path(url)
+        if not records:
+            if os.path.isfile(path):
+                os.remove(path)
+            return
+        os.makedirs(self.spool_dir, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            for record in records[-self.config.get("max_spool", 10000):]:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def _upload(self, url: str, records: List[dict]):
+        """send spooled records followed by new records, spool anything that could not be sent"""
+        spooled = self._read_spool(url)
+        # records are shared by all endpoints, copy them so attempts are counted per endpoint
+        pending = spooled + [dict(record) for record in records]
+        if not pending:
+            return
+        session = self._get_session(url)
+        done = 0  # records that were delivered or dropped
+        for record in pending:
+            data = {k: v for k, v in record.items() if k != "_attempts"}
+            try:
+                # Add a timeout to prevent hanging
+                response = session.post(url, data=data, timeout=3)
+            except Exception as e:
+                LOG.warning(f"Failed to upload metrics to '{url}', spooling {len(pending) - done} records: {e}")
+                break
+            if not response.ok:
+                if response.status_code < 500 and response.status_code not in self.RETRY_STATUS:
+                    LOG.warning(f"'{url}' rejected intent metrics record ({response.status_code}), dropping it")
+                    done += 1
+                    continue
+                record["_attempts"] = record.get("_attempts", 0) + 1
+                if record["_attempts"] >= self.config.get("max_attempts", 5):
+                    LOG.warning(f"'{url}' failed intent metrics record {record['_attempts']} times "
+                                f"({response.status_code}), dropping it")
+                    done += 1
+                    continue
+                LOG.warning(f"Failed to upload metrics to '{url}' ({response.status_code}), "
+                            f"spooling {len(pending) - done} records")
+                break
+            done += 1
+        else:
+            LOG.info(f"Uploaded {done} intent metrics records to '{url}'")
+        if spooled or done < len(pending):
+            self._write_spool(url, pending[done:])
+
+    def shutdown(self):
+        """flush queued records and stop the background thread"""
+        self._stop_event.set()
+        with self._cond:
+            self._cond.notify()
+        if self.is_alive():
+            self.join(timeout=5)
+        else:
+            self.flush()
+        for session in self._sessions.values():
+            session.close()
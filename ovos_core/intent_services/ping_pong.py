@@ -0,0 +1,222 @@
+"""helpers for the skill ping/pong negotiation used by the pipeline plugins"""
+import time
+from collections import deque
+from threading import Condition, Lock
+from typing import Callable, Dict, Iterable, Optional
+from uuid import uuid4
+
+from ovos_bus_client.message import Message
+from ovos_bus_client.session import Session
+from ovos_utils.log import LOG
+
+
+class LatencyTracker:
+    """rolling window of ping/pong response times per skill
+
+    used to give each skill an adaptive deadline instead of a fixed timeout,
+    skills that answer fast get a tight deadline, skills that time out get the full budget again
+    """
+
+    def __init__(self, max_timeout: float = 0.5, min_timeout: float = 0.1,
+                 factor: float = 2.0, window: int = 20):
+        self.max_timeout = max_timeout
+        self.min_timeout = min_timeout
+        self.factor = factor
+        self.window = window
+        self._samples: Dict[str, deque] = {}
+        self._timeouts: Dict[str, int] = {}
+        self._lock = Lock()
+
+    def record(self, skill_id: str, latency: float):
+        """track the response time of a skill"""
+        with self._lock:
+            if skill_id not in self._samples:
+                self._samples[skill_id] = deque(maxlen=self.window)
+            self._samples[skill_id].append(latency)
+
+    def record_timeout(self, skill_id: str):
+        """skill did not answer before its deadline, give it the full budget next time"""
+        self.record(skill_id, self.max_timeout)
+        with self._lock:
+            self._timeouts[skill_id] = self._timeouts.get(skill_id, 0) + 1
+
+    def percentile(self, skill_id: str, pct: float = 0.95) -> Optional[float]:
+        with self._lock:
+            samples = sorted(self._samples.get(skill_id) or [])
+        if not samples:
+            return None
+        idx = min(len(samples) - 1, int(round(pct * (len(samples) - 1))))
+        return samples[idx]
+
+    def deadline(self, skill_id: str) -> float:
+        """seconds to wait for a pong from this skill"""
+        p95 = self.percentile(skill_id)
+        if p95 is None:  # never answered, use full budget
+            return self.max_timeout
+        return min(self.max_timeout, max(self.min_timeout, p95 * self.factor))
+
+    def stats(self) -> Dict[str, dict]:
+        with self._lock:
+            skill_ids = list(self._samples)
+        data = {}
+        for skill_id in skill_ids:
+            with self._lock:
+                samples = list(self._samples[skill_id])
+                timeouts = self._timeouts.get(skill_id, 0)
+            data[skill_id] = {"samples": len(samples),
+                              "timeouts": timeouts,
+                              "mean": sum(samples) / len(samples),
+                              "p50": self.percentile(skill_id, 0.5),
+                              "p95": self.percentile(skill_id, 0.95),
+                              "deadline": self.deadline(skill_id)}
+        return data
+
+
+class PendingPing:
+    """answers collected for a single ping, keyed by skill_id"""
+
+    def __init__(self, pong_type: str, session_id: str, skill_ids: Iterable[str]):
+        self.ping_id = uuid4().hex
+        self.pong_type = pong_type
+        self.session_id = session_id
+        self.skill_ids = set(skill_ids)  # skills that are expected to answer
+        self.answers: Dict[str, bool] = {}  # skill_id: can_handle
+        self.latencies: Dict[str, float] = {}  # skill_id: seconds until the pong arrived
+        self.cond = Condition()
+        self.start = time.monotonic()
+
+    def context(self, message: Message) -> dict:
+        """copy of message.context tagged with the correlation id of this ping"""
+        return {**message.context, PingPongMultiplexer.context_key: self.ping_id}
+
+    def answer(self, skill_id: str, can_handle: bool) -> bool:
+        """record an answer, returns False if it was not expected or already known"""
+        with self.cond:
+            if skill_id not in self.skill_ids or skill_id in self.answers:
+                return False
+            self.answers[skill_id] = can_handle
+            self.latencies[skill_id] = time.monotonic() - self.start
+            self.cond.notify_all()
+        return True
+
+    def wait_for(self, predicate: Callable[[], bool], timeout: float) -> bool:
+        """wait until predicate is True or timeout seconds elapsed"""
+        with self.cond:
+            return self.cond.wait_for(predicate, timeout=max(timeout, 0))
+
+
+class PingPongMultiplexer:
+    """route pong replies to the pending ping that asked for them
+
+    a single permanent bus handler is registered per pong type, instead of a
+    temporary handler per utterance that also receives the pongs of every other session.
+    pings carry a correlation id in their context, skills answer with message.reply so it is preserved.
+    pongs without a correlation id are delivered to the pending pings of the same session,
+    pongs that arrive after their ping was closed are passed to on_late_pong(session_id, skill_id)
+    """
+    context_key = "ping_id"
+
+    def __init__(self, bus, on_late_pong: Optional[Callable[[str, str], None]] = None):
+        self.bus = bus
+        self.on_late_pong = on_late_pong
+        self._pending: Dict[str, PendingPing] = {}  # ping_id: PendingPing
+        self._pong_types = set()  # msg_types with a registered handle_pong
+        self._lock = Lock()
+
+    def open(self, pong_type: str, session_id: str, skill_ids: Iterable[str]) -> PendingPing:
+        """start tracking answers for a new ping, call close once done"""
+        ping = PendingPing(pong_type, session_id, skill_ids)
+        with self._lock:
+            if pong_type not in self._pong_types:
+                self._pong_types.add(pong_type)
+                self.bus.on(pong_type, self.handle_pong)
+            self._pending[ping.ping_id] = ping
+        return ping
+
+    def close(self, ping: PendingPing):
+        with self._lock:
+            self._pending.pop(ping.ping_id, None)
+
+    def handle_pong(self, message: Message):
+        skill_id = message.data.get("skill_id")
+        can_handle = message.data.get("can_handle", True)
+        ping_id = message.context.get(self.context_key)
+        session_id = (message.context.get("session") or {}).get("session_id", "default")
+        with self._lock:
+            if ping_id:
+                pings = [self._pending[ping_id]] if ping_id in self._pending else []
+            else:  # pong without correlation id, deliver to every ping of this session
+                pings = [p for p in self._pending.values()
+                         if p.pong_type == message.msg_type and p.session_id == session_id]
+        for ping in pings:
+            if ping.answer(skill_id, can_handle):
+                LOG.debug(f"{message.msg_type}: {skill_id} can_handle={can_handle}")
+        if not pings and skill_id and self.on_late_pong:
+            self.on_late_pong(session_id, skill_id)
+
+    def shutdown(self):
+        with self._lock:
+            for pong_type in self._pong_types:
+                self.bus.remove(pong_type, self.handle_pong)
+            self._pong_types.clear()
+            self._pending.clear()
+
+
+class UnresponsiveCache:
+    """skills that recently failed to answer a ping, per session
+
+    pinging them again would only add their full timeout to every utterance,
+    an entry is ignored once it expires or the skill state in the session changes
+    (skill was (re)activated or its utterance state changed, eg. get_response started),
+    entries of a skill are dropped when it is loaded or unloaded
+    """
+
+    def __init__(self, bus, ttl: float = 30):
+        self.bus = bus
+        self.ttl = ttl
+        self._entries: Dict[tuple, tuple] = {}  # (session_id, skill_id): (expires, skill state)
+        self._lock = Lock()
+        self.bus.on("mycroft.skill.loaded", self.handle_skill_changed)
+        self.bus.on("mycroft.skills.shutdown", self.handle_skill_changed)
+        self.bus.on("detach_skill", self.handle_skill_changed)
+
+    @staticmethod
+    def _skill_state(session: Session, skill_id: str) -> tuple:
+        activated = next((ts for s, ts in session.active_skills if s == skill_id), None)
+        return activated, session.utterance_states.get(skill_id)
+
+    def add(self, session: Session, skill_id: str):
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries[(session.session_id, skill_id)] = (time.monotonic() + self.ttl,
+                                                             self._skill_state(session, skill_id))
+
+    def is_unresponsive(self, session: Session, skill_id: str) -> bool:
+        key = (session.session_id, skill_id)
+        with self._lock:
+            if key not in self._entries:
+                return False
+            expires, state = self._entries[key]
+            if time.monotonic() < expires and state == self._skill_state(session, skill_id):
+                return True
+            self._entries.pop(key)
+        return False
+
+    def invalidate(self, session_id: Optional[str] = None, skill_id: Optional[str] = None):
+        """drop the entries matching session_id and/or skill_id, everything if neither is given"""
+        with self._lock:
+            for key in [k for k in self._entries
+                        if (session_id is None or k[0] == session_id)
+                        and (skill_id is None or k[1] == skill_id)]:
+                self._entries.pop(key)
+
+    def handle_skill_changed(self, message: Message):
+        skill_id = message.data.get("skill_id") or message.data.get("id")
+        if skill_id:
+            self.invalidate(skill_id=skill_id)
+
+    def shutdown(self):
+        self.bus.remove("mycroft.skill.loaded", self.handle_skill_changed)
+        self.bus.remove("mycroft.skills.shutdown", self.handle_skill_changed)
+        self.bus.remove("detach_skill", self.handle_skill_changed)
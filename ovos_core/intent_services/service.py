@@ -13,30 +13,66 @@
 # limitations under the License.
 #
 
-import json
 import re
 import time
-from collections import defaultdict
-from typing import Tuple, Callable, List
+from collections import defaultdict, OrderedDict
+from concurrent.futures import ThreadPoolExecutor, Future
+from threading import Lock
+from typing import Tuple, Callable, List, Dict, Optional
 
-import requests
-from langcodes import closest_match
 from ovos_bus_client.message import Message
-from ovos_bus_client.session import SessionManager
+from ovos_bus_client.session import SessionManager, Session
 from ovos_bus_client.util import get_message_lang
 from ovos_config.config import Configuration
 from ovos_config.locale import get_valid_languages
-from ovos_utils.lang import standardize_lang_tag
 from ovos_utils.log import LOG
 from ovos_utils.metrics import Stopwatch
 from ovos_utils.process_utils import ProcessStatus, StatusCallbackMap
-from ovos_utils.thread_utils import create_daemon
 
+from ovos_core.intent_services.dispatcher import SessionDispatcher
+from ovos_core.intent_services.lang import closest_lang, standardize_lang
+from ovos_core.intent_services.metrics import IntentMetricsUploader
+from ovos_core.startup_profiler import profiler
 from ovos_core.transformers import MetadataTransformersService, UtteranceTransformersService, IntentTransformersService
 from ovos_plugin_manager.pipeline import OVOSPipelineFactory
 from ovos_plugin_manager.templates.pipeline import IntentHandlerMatch, ConfidenceMatcherPipeline
 
 
+# legacy pipeline names -> plugin ids
+_PIPELINE_MIGRATION_MAP = {
+    "converse": "ovos-converse-pipeline-plugin",
+    "common_qa": "ovos-common-query-pipeline-plugin",
+    "fallback_high": "ovos-fallback-pipeline-plugin-high",
+    "fallback_medium": "ovos-fallback-pipeline-plugin-medium",
+    "fallback_low": "ovos-fallback-pipeline-plugin-low",
+    "stop_high": "ovos-stop-pipeline-plugin-high",
+    "stop_medium": "ovos-stop-pipeline-plugin-medium",
+    "stop_low": "ovos-stop-pipeline-plugin-low",
+    "adapt_high": "ovos-adapt-pipeline-plugin-high",
+    "adapt_medium": "ovos-adapt-pipeline-plugin-medium",
+    "adapt_low": "ovos-adapt-pipeline-plugin-low",
+    "padacioso_high": "ovos-padacioso-pipeline-plugin-high",
+    "padacioso_medium": "ovos-padacioso-pipeline-plugin-medium",
+    "padacioso_low": "ovos-padacioso-pipeline-plugin-low",
+    "padatious_high": "ovos-padatious-pipeline-plugin-high",
+    "padatious_medium": "ovos-padatious-pipeline-plugin-medium",
+    "padatious_low": "ovos-padatious-pipeline-plugin-low",
+    "ocp_high": "ovos-ocp-pipeline-plugin-high",
+    "ocp_medium": "ovos-ocp-pipeline-plugin-medium",
+    "ocp_low": "ovos-ocp-pipeline-plugin-low",
+    "ocp_legacy": "ovos-ocp-pipeline-plugin-legacy"
+}
+_CONFIDENCE_SUFFIX = re.compile(r'-(high|medium|low)$')
+# pipeline plugins whose matchers don't ping skills or modify the session, safe to evaluate speculatively
+# NOTE: adapt is not listed, it injects context into the session on a hit even if a higher priority
+# matcher wins, it can still be added via "speculative_pipelines" if that is acceptable
+_SPECULATIVE_PIPELINES = [
+    "ovos-padatious-pipeline-plugin",
+    "ovos-padacioso-pipeline-plugin",
+    "ovos-m2v-pipeline"
+]
+
+
 def on_started():
     LOG.info('IntentService is starting up.')
 
@@ -89,16 +125,29 @@ class IntentService:
 
         # load and cache the plugins right away so they receive all bus messages
         self.pipeline_plugins = {}
-
-        self.utterance_plugins = UtteranceTransformersService(bus)
-        self.metadata_plugins = MetadataTransformersService(bus)
-        self.intent_plugins = IntentTransformersService(bus)
+        # compiled pipelines, (pipeline ids, plugins generation) -> ((pipeline_id, matcher), ...)
+        self._pipeline_generation = 0
+        self._pipeline_cache = OrderedDict()
+        self._pipeline_lock = Lock()
+        self._speculative_executor = None
+        # concurrent utterance processing across sessions, strictly ordered within a session
+        self._dispatcher = None
+        if self.config.get("concurrent_sessions"):
+            self._dispatcher = SessionDispatcher(self.config.get("session_workers", 8))
+        self.metrics_uploader = IntentMetricsUploader()
+
+        with profiler.span("UtteranceTransformersService.__init__", "transformers"):
+            self.utterance_plugins = UtteranceTransformersService(bus)
+        with profiler.span("MetadataTransformersService.__init__", "transformers"):
+            self.metadata_plugins = MetadataTransformersService(bus)
+        with profiler.span("IntentTransformersService.__init__", "transformers"):
+            self.intent_plugins = IntentTransformersService(bus)
 
         # connection SessionManager to the bus,
         # this will sync default session across all components
         SessionManager.connect_to_bus(self.bus)
 
-        self.bus.on('recognizer_loop:utterance', self.handle_utterance)
+        self.bus.on('recognizer_loop:utterance', self.dispatch_utterance)
 
         # Context related handlers
         self.bus.on('add_context', self.handle_add_context)
@@ -107,6 +156,7 @@ class IntentService:
 
         # Intents API
         self.bus.on('intent.service.intent.get', self.handle_get_intent)
+        self.bus.on('intent.service.intent.get_batch', self.handle_get_intent_batch)
 
         # internal, track skills that call self.deactivate to avoid reactivating them again
         self._deactivations = defaultdict(list)
@@ -118,14 +168,20 @@ class IntentService:
             self.bus.emit(Message('intent.service.pipelines.reload'))
 
     def handle_reload_pipelines(self, message: Message):
-        pipeline_plugins = OVOSPipelineFactory.get_installed_pipeline_ids()
+        with profiler.span("find_pipeline_plugins", "discovery"):
+            pipeline_plugins = OVOSPipelineFactory.get_installed_pipeline_ids()
         LOG.debug(f"Installed pipeline plugins: {pipeline_plugins}")
         for p in pipeline_plugins:
             try:
-                self.pipeline_plugins[p] = OVOSPipelineFactory.load_plugin(p, bus=self.bus)
+                with profiler.span(p, "pipeline"):
+                    self.pipeline_plugins[p] = OVOSPipelineFactory.load_plugin(p, bus=self.bus)
                 LOG.debug(f"Loaded pipeline plugin: '{p}'")
             except Exception as e:
                 LOG.error(f"Failed to load pipeline plugin '{p}': {e}")
+        # plugin instances changed, invalidate compiled pipelines
+        with self._pipeline_lock:
+            self._pipeline_generation += 1
+            self._pipeline_cache.clear()
         self.status.set_ready()
 
     def _handle_transformers(self, message):
@@ -153,15 +209,15 @@ class IntentService:
         """
         default_lang = get_message_lang(message)
         valid_langs = message.context.get("valid_langs") or get_valid_languages()
-        valid_langs = [standardize_lang_tag(l) for l in valid_langs]
+        valid_langs = tuple(standardize_lang(l) for l in valid_langs)
         lang_keys = ["stt_lang",
                      "request_lang",
                      "detected_lang"]
         for k in lang_keys:
             if k in message.context:
                 try:
-                    v = standardize_lang_tag(message.context[k])
-                    best_lang, _ = closest_match(v, valid_langs, max_distance=10)
+                    v = standardize_lang(message.context[k])
+                    best_lang, _ = closest_lang(v, valid_langs, max_distance=10)
                 except:
                     v = message.context[k]
                     best_lang = "und"
@@ -183,32 +239,8 @@ class IntentService:
         Returns:
             A callable matcher function.
         """
-        migration_map = {
-            "converse": "ovos-converse-pipeline-plugin",
-            "common_qa": "ovos-common-query-pipeline-plugin",
-            "fallback_high": "ovos-fallback-pipeline-plugin-high",
-            "fallback_medium": "ovos-fallback-pipeline-plugin-medium",
-            "fallback_low": "ovos-fallback-pipeline-plugin-low",
-            "stop_high": "ovos-stop-pipeline-plugin-high",
-            "stop_medium": "ovos-stop-pipeline-plugin-medium",
-            "stop_low": "ovos-stop-pipeline-plugin-low",
-            "adapt_high": "ovos-adapt-pipeline-plugin-high",
-            "adapt_medium": "ovos-adapt-pipeline-plugin-medium",
-            "adapt_low": "ovos-adapt-pipeline-plugin-low",
-            "padacioso_high": "ovos-padacioso-pipeline-plugin-high",
-            "padacioso_medium": "ovos-padacioso-pipeline-plugin-medium",
-            "padacioso_low": "ovos-padacioso-pipeline-plugin-low",
-            "padatious_high": "ovos-padatious-pipeline-plugin-high",
-            "padatious_medium": "ovos-padatious-pipeline-plugin-medium",
-            "padatious_low": "ovos-padatious-pipeline-plugin-low",
-            "ocp_high": "ovos-ocp-pipeline-plugin-high",
-            "ocp_medium": "ovos-ocp-pipeline-plugin-medium",
-            "ocp_low": "ovos-ocp-pipeline-plugin-low",
-            "ocp_legacy": "ovos-ocp-pipeline-plugin-legacy"
-        }
-
-        matcher_id = migration_map.get(matcher_id, matcher_id)
-        pipe_id = re.sub(r'-(high|medium|low)$', '', matcher_id)
+        matcher_id = _PIPELINE_MIGRATION_MAP.get(matcher_id, matcher_id)
+        pipe_id = _CONFIDENCE_SUFFIX.sub('', matcher_id)
         plugin = self.pipeline_plugins.get(pipe_id)
         if not plugin:
             LOG.error(f"Unknown pipeline matcher: {matcher_id}")
@@ -223,25 +255,80 @@ class IntentService:
                 return plugin.match_low
         return plugin.match
 
+    def _compile_pipeline(self, pipeline: Tuple[str, ...]) -> Tuple[Tuple[str, Callable], ...]:
+        """resolve every pipeline id into its matcher function, dropping any that failed to load"""
+        matchers = [(p, self.get_pipeline_matcher(p)) for p in pipeline]
+        matchers = tuple(m for m in matchers if m[1] is not None)  # filter any that failed to load
+        final_pipeline = [k[0] for k in matchers]
+        if list(pipeline) != final_pipeline:
+            LOG.warning(f"Requested some invalid pipeline components! "
+                        f"filtered: {[k for k in pipeline if k not in final_pipeline]}")
+        LOG.debug(f"Session final pipeline: {final_pipeline}")
+        return matchers
+
     def get_pipeline(self, session=None) -> List[Tuple[str, Callable]]:
         """return a list of matcher functions ordered by priority
         utterances will be sent to each matcher in order until one can handle the utterance
         the list can be configured in mycroft.conf under intents.pipeline,
-        in the future plugins will be supported for users to define their own pipeline"""
+        in the future plugins will be supported for users to define their own pipeline
+
+        compiled pipelines are cached per (pipeline ids, loaded plugins generation),
+        the cache is invalidated whenever pipeline plugins are reloaded"""
         session = session or SessionManager.get()
-        matchers = [(p, self.get_pipeline_matcher(p)) for p in session.pipeline]
-        matchers = [m for m in matchers if m[1] is not None]  # filter any that failed to load
-        final_pipeline = [k[0] for k in matchers]
-        if session.pipeline != final_pipeline:
-            LOG.warning(f"Requested some invalid pipeline components! "
-                        f"filtered: {[k for k in session.pipeline if k not in final_pipeline]}")
-        LOG.debug(f"Session final pipeline: {final_pipeline}")
-        return matchers
+        key = (tuple(session.pipeline), self._pipeline_generation)
+        with self._pipeline_lock:
+            matchers = self._pipeline_cache.get(key)
+            if matchers is not None:
+                self._pipeline_cache.move_to_end(key)
+                return list(matchers)
+        matchers = self._compile_pipeline(key[0])
+        with self._pipeline_lock:
+            if key[1] == self._pipeline_generation:  # plugins not reloaded while compiling
+                self._pipeline_cache[key] = matchers
+                while len(self._pipeline_cache) > self.config.get("pipeline_cache_size", 32):
+                    self._pipeline_cache.popitem(last=False)
+        return list(matchers)
+
+    def _is_speculative(self, pipeline_id: str) -> bool:
+        """side effect free matchers (that don't ping skills) can be evaluated ahead of time"""
+        plugin_id = _CONFIDENCE_SUFFIX.sub('', _PIPELINE_MIGRATION_MAP.get(pipeline_id, pipeline_id))
+        return plugin_id in self.config.get("speculative_pipelines", _SPECULATIVE_PIPELINES)
+
+    def _start_speculative_matching(self, matchers: List[Tuple[str, Callable]], langs: List[str],
+                                    utterances: List[str], message: Message) -> Dict[Tuple[str, str], Future]:
+        """if enabled, submit all side effect free matchers to a worker pool right away
+
+        results are still consumed in pipeline priority order by handle_utterance,
+        so a slow model based matcher runs while converse/stop are being evaluated
+
+        once a higher priority match is found the remaining futures are cancelled,
+        Future.cancel() only drops matchers that did not start yet, running ones finish
+        in the background and their result is discarded
+
+        Returns:
+            dict of (pipeline_id, lang): Future
+        """
+        if not self.config.get("speculative_matching"):
+            return {}
+        if self._speculative_executor is None:
+            self._speculative_executor = ThreadPoolExecutor(
+                max_workers=self.config.get("speculative_workers", 4),
+                thread_name_prefix="speculative_matching")
+        futures = {}
+        for pipeline, match_func in matchers:
+            if not self._is_speculative(pipeline):
+                continue
+            # matchers evaluated inline (eg. fallback) may modify message.data
+            msg = Message(message.msg_type, dict(message.data), dict(message.context))
+            for intent_lang in langs:
+                futures[(pipeline, intent_lang)] = self._speculative_executor.submit(
+                    match_func, utterances, intent_lang, msg)
+        return futures
 
     @staticmethod
     def _validate_session(message, lang):
         # get session
-        lang = standardize_lang_tag(lang)
+        lang = standardize_lang(lang)
         sess = SessionManager.get(message)
         if sess.session_id == "default":
             updated = False
@@ -316,10 +403,7 @@ class IntentService:
             reply = message.reply(match.match_type, data)
 
             # upload intent metrics if enabled
-            create_daemon(self._upload_match_data, (match.utterance,
-                                                    match.match_type,
-                                                    lang,
-                                                    match.match_data))
+            self.metrics_uploader.submit(match.utterance, match.match_type, lang, match.match_data)
 
         if reply is not None:
             reply.data["utterance"] = match.utterance
@@ -346,41 +430,7 @@ class IntentService:
             self.bus.emit(reply)
 
         else:  # upload intent metrics if enabled
-            create_daemon(self._upload_match_data, (match.utterance,
-                                                    "complete_intent_failure",
-                                                    lang,
-                                                    match.match_data))
-
-    @staticmethod
-    def _upload_match_data(utterance: str, intent: str, lang: str, match_data: dict):
-        """if enabled upload the intent match data to a server, allowing users and developers
-        to collect metrics/datasets to improve the pipeline plugins and skills.
-
-        There isn't a default server to upload things too, users needs to explicitly configure one
-
-        https://github.com/OpenVoiceOS/ovos-opendata-server
-        """
-        config = Configuration().get("open_data", {})
-        endpoints: List[str] = config.get("intent_urls", [])  # eg. "http://localhost:8000/intents"
-        if not endpoints:
-            return  # user didn't configure any endpoints to upload metrics to
-        if isinstance(endpoints, str):
-            endpoints = [endpoints]
-        headers = {"Content-Type": "application/x-www-form-urlencoded",
-                   "User-Agent": config.get("user_agent", "ovos-metrics")}
-        data = {
-            "utterance": utterance,
-            "intent": intent,
-            "lang": lang,
-            "match_data": json.dumps(match_data, ensure_ascii=False)
-        }
-        for url in endpoints:
-            try:
-                # Add a timeout to prevent hanging
-                response = requests.post(url, data=data, headers=headers, timeout=3)
-                LOG.info(f"Uploaded intent metrics to '{url}' - Response: {response.status_code}")
-            except Exception as e:
-                LOG.warning(f"Failed to upload metrics: {e}")
+            self.metrics_uploader.submit(match.utterance, "complete_intent_failure", lang, match.match_data)
 
     def send_cancel_event(self, message):
         """
@@ -409,6 +459,24 @@ class IntentService:
         self.bus.emit(message.reply("ovos.utterance.cancelled"))
         self.bus.emit(message.reply("ovos.utterance.handled"))
 
+    def dispatch_utterance(self, message: Message):
+        """handle 'recognizer_loop:utterance' from the messagebus
+
+        by default the utterance is handled in the bus thread that delivered it,
+        if "concurrent_sessions" is enabled utterances are handed to a worker pool instead,
+        each session is processed in order but different sessions don't wait for each other
+
+            "intents": {
+                "concurrent_sessions": true,
+                "session_workers": 8
+            }
+        """
+        if self._dispatcher is None:
+            self.handle_utterance(message)
+            return
+        session_id = (message.context.get("session") or {}).get("session_id", "default")
+        self._dispatcher.submit(session_id, self.handle_utterance, message)
+
     def handle_utterance(self, message: Message):
         """Main entrypoint for handling user utterances
 
@@ -459,38 +527,49 @@ class IntentService:
         match = None
         with stopwatch:
             self._deactivations[sess.session_id] = []
-            # Loop through the matching functions until a match is found.
-            for pipeline, match_func in self.get_pipeline(session=sess):
-                langs = [lang]
-                if self.config.get("multilingual_matching"):
-                    # if multilingual matching is enabled, attempt to match all user languages if main fails
-                    langs += [l for l in get_valid_languages() if l != lang]
-                for intent_lang in langs:
-                    match = match_func(utterances, intent_lang, message)
-                    if match:
-                        LOG.info(f"{pipeline} match ({intent_lang}): {match}")
-                        if match.skill_id and match.skill_id in sess.blacklisted_skills:
-                            LOG.debug(
-                                f"ignoring match, skill_id '{match.skill_id}' blacklisted by Session '{sess.session_id}'")
-                            continue
-                        if isinstance(match, IntentHandlerMatch) and match.match_type in sess.blacklisted_intents:
-                            LOG.debug(
-                                f"ignoring match, intent '{match.match_type}' blacklisted by Session '{sess.session_id}'")
-                            continue
-                        try:
-                            self._emit_match_message(match, message, intent_lang)
-                            break
-                        except:
-                            LOG.exception(f"{match_func} returned an invalid match")
+            langs = [lang]
+            if self.config.get("multilingual_matching"):
+                # if multilingual matching is enabled, attempt to match all user languages if main fails
+                langs += [l for l in get_valid_languages() if l != lang]
+            matchers = self.get_pipeline(session=sess)
+            speculative = self._start_speculative_matching(matchers, langs, utterances, message)
+            try:
+                # Loop through the matching functions until a match is found.
+                for pipeline, match_func in matchers:
+                    for intent_lang in langs:
+                        if (pipeline, intent_lang) in speculative:
+                            match = speculative[(pipeline, intent_lang)].result()
+                        else:
+                            match = match_func(utterances, intent_lang, message)
+                        if match:
+                            LOG.info(f"{pipeline} match ({intent_lang}): {match}")
+                            if match.skill_id and match.skill_id in sess.blacklisted_skills:
+                                LOG.debug(
+                                    f"ignoring match, skill_id '{match.skill_id}' blacklisted by Session '{sess.session_id}'")
+                                continue
+                            if isinstance(match, IntentHandlerMatch) and match.match_type in sess.blacklisted_intents:
+                                LOG.debug(
+                                    f"ignoring match, intent '{match.match_type}' blacklisted by Session '{sess.session_id}'")
+                                continue
+                            try:
+                                self._emit_match_message(match, message, intent_lang)
+                                break
+                            except:
+                                LOG.exception(f"{match_func} returned an invalid match")
+                    else:
+                        LOG.debug(f"no match from {match_func}")
+                        continue
+                    break
                 else:
-                    LOG.debug(f"no match from {match_func}")
-                    continue
-                break
-            else:
-                # Nothing was able to handle the intent
-                # Ask politely for forgiveness for failing in this vital task
-                message.data["lang"] = lang
-                self.send_complete_intent_failure(message)
+                    # Nothing was able to handle the intent
+                    # Ask politely for forgiveness for failing in this vital task
+                    message.data["lang"] = lang
+                    self.send_complete_intent_failure(message)
+            finally:
+                # higher priority match confirmed, lower priority work is no longer needed
+                # NOTE: this only prevents queued matchers from starting, running ones can't be interrupted
+                for future in speculative.values():
+                    future.cancel()
 
         LOG.debug(f"intent matching took: {stopwatch.time}")
 
@@ -554,20 +633,17 @@ class IntentService:
         sess = SessionManager.get(message)
         sess.context.clear_context()
 
-    def handle_get_intent(self, message):
-        """Get intent from either adapt or padatious.
+    def _match_intent(self, utterances: List[str], lang: str, message: Message,
+                      matchers: List[Tuple[str, Callable]]) -> Optional[dict]:
+        """run utterances through the pipeline without triggering the matched intent
 
-        Args:
-            message (Message): message containing utterance
+        Returns:
+            intent data of the first valid match, or None
         """
-        utterance = message.data["utterance"]
-        lang = get_message_lang(message)
-        sess = SessionManager.get(message)
-        match = None
         # Loop through the matching functions until a match is found.
-        for pipeline, match_func in self.get_pipeline(session=sess):
+        for pipeline, match_func in matchers:
             s = time.monotonic()
-            match = match_func([utterance], lang, message)
+            match = match_func(utterances, lang, message)
             LOG.debug(f"matching '{pipeline}' took: {time.monotonic() - s} seconds")
             if match:
                 if match.match_type:
@@ -577,18 +653,84 @@ class IntentService:
                     intent_data["skill_id"] = match.skill_id
                     intent_data["handler"] = match_func.__name__
                     LOG.debug(f"final intent match: {intent_data}")
-                    m = message.reply("intent.service.intent.reply",
-                                      {"intent": intent_data, "utterance": utterance})
-                    self.bus.emit(m)
-                    return
+                    return intent_data
                 LOG.error(f"bad pipeline match! {match}")
-        # signal intent failure
+        return None
+
+    def handle_get_intent(self, message):
+        """Get intent from either adapt or padatious.
+
+        Args:
+            message (Message): message containing utterance
+        """
+        utterance = message.data["utterance"]
+        lang = get_message_lang(message)
+        sess = SessionManager.get(message)
+        intent_data = self._match_intent([utterance], lang, message, self.get_pipeline(session=sess))
+        # None signals intent failure
         self.bus.emit(message.reply("intent.service.intent.reply",
-                                    {"intent": None, "utterance": utterance}))
+                                    {"intent": intent_data, "utterance": utterance}))
+
+    def match_batch(self, utterances: List[str], lang: Optional[str] = None,
+                    session: Optional[Session] = None) -> List[dict]:
+        """Match many utterances at once, eg. to replay logged utterances for regression testing
+
+        The session pipeline is compiled once, utterance transformers run in batch mode
+        where plugins support it. Matched intents are NOT triggered.
+
+        Args:
+            utterances: list of utterances to match
+            lang: language of the utterances, defaults to the session lang
+            session: session to match against, defaults to the default session
+
+        Returns:
+            list of {"utterance", "intent", "time"} dicts, "intent" is None if nothing matched,
+            "time" includes the share of the batch utterance transformers time of each utterance
+        """
+        session = session or SessionManager.get()
+        lang = standardize_lang(lang or session.lang)
+        matchers = self.get_pipeline(session=session)
+        context = {"session": session.serialize(), "lang": lang}
+
+        results = []
+        start = time.monotonic()
+        transformed = self.utterance_plugins.transform_batch([[u] for u in utterances], context)
+        # batch plugins process all utterances at once, split their cost evenly
+        transform_time = (time.monotonic() - start) / max(len(utterances), 1)
+        for utterance, (utts, ctx) in zip(utterances, transformed):
+            start = time.monotonic() - transform_time
+            ctx = self.metadata_plugins.transform(ctx)
+            intent_data = None
+            if not ctx.get("canceled"):
+                message = Message("intent.service.intent.get_batch",
+                                  {"utterances": utts, "lang": lang}, ctx)
+                intent_data = self._match_intent(utts, lang, message, matchers)
+            results.append({"utterance": utterance,
+                            "intent": intent_data,
+                            "time": time.monotonic() - start})
+        return results
+
+    def handle_get_intent_batch(self, message: Message):
+        """Get intents for a list of utterances, see match_batch
+
+        Args:
+            message (Message): message containing utterances
+        """
+        utterances = message.data["utterances"]
+        lang = get_message_lang(message)
+        sess = SessionManager.get(message)
+        matches = self.match_batch(utterances, lang, sess)
+        self.bus.emit(message.reply("intent.service.intent.reply_batch",
+                                    {"matches": matches, "lang": lang}))
 
     def shutdown(self):
         self.utterance_plugins.shutdown()
         self.metadata_plugins.shutdown()
+        self.metrics_uploader.shutdown()
+        if self._speculative_executor:
+            self._speculative_executor.shutdown(wait=False, cancel_futures=True)
+        if self._dispatcher:
+            self._dispatcher.shutdown()
         for pipeline in self.pipeline_plugins.values():
             if hasattr(pipeline, "stop"):
                 try:
@@ -603,11 +745,12 @@ class IntentService:
                     LOG.warning(f"Failed to shutdown pipeline {pipeline}: {e}")
                     continue
 
-        self.bus.remove('recognizer_loop:utterance', self.handle_utterance)
+        self.bus.remove('recognizer_loop:utterance', self.dispatch_utterance)
         self.bus.remove('add_context', self.handle_add_context)
         self.bus.remove('remove_context', self.handle_remove_context)
         self.bus.remove('clear_context', self.handle_clear_context)
         self.bus.remove('intent.service.intent.get', self.handle_get_intent)
+        self.bus.remove('intent.service.intent.get_batch', self.handle_get_intent_batch)
 
         self.status.set_stopping()
 
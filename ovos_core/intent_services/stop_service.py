@@ -1,10 +1,8 @@
 import os
 import re
 from os.path import dirname
-from threading import Event
 from typing import Optional, Dict, List, Union
 
-from langcodes import closest_match
 from ovos_bus_client.client import MessageBusClient
 from ovos_bus_client.message import Message
 from ovos_bus_client.session import SessionManager, UtteranceState
@@ -18,6 +16,9 @@ from ovos_utils.lang import standardize_lang_tag
 from ovos_utils.log import LOG
 from ovos_utils.parse import match_one
 
+from ovos_core.intent_services.lang import closest_lang, standardize_lang
+from ovos_core.intent_services.ping_pong import PingPongMultiplexer, UnresponsiveCache
+
 
 class StopService(ConfidenceMatcherPipeline):
     """Intent Service thats handles stopping skills."""
@@ -27,6 +28,12 @@ class StopService(ConfidenceMatcherPipeline):
         config = config or Configuration().get("skills", {}).get("stop") or {}
         super().__init__(config=config, bus=bus)
         self._voc_cache = {}
+        self._voc_exact = {}  # lang: {voc_name: set of normalized phrases}
+        self._voc_regex = {}  # lang: {voc_name: compiled word boundary alternation}
+        self.unresponsive = UnresponsiveCache(self.bus, ttl=self.config.get("unresponsive_cache_ttl", 30))
+        # a late answer means the skill is alive after all
+        self.pings = PingPongMultiplexer(self.bus, on_late_pong=lambda session_id, skill_id:
+                                         self.unresponsive.invalidate(session_id, skill_id))
         self.load_resource_files()
         self.bus.on("stop:global", self.handle_global_stop)
         self.bus.on("stop:skill", self.handle_skill_stop)
@@ -45,12 +52,26 @@ class StopService(ConfidenceMatcherPipeline):
         for lang in os.listdir(base):
             lang2 = standardize_lang_tag(lang)
             self._voc_cache[lang2] = {}
+            self._voc_exact[lang2] = {}
+            self._voc_regex[lang2] = {}
             for f in os.listdir(f"{base}/{lang}"):
                 with open(f"{base}/{lang}/{f}", encoding="utf-8") as fi:
                     lines = [expand_template(l) for l in fi.read().split("\n")
                              if l.strip() and not l.startswith("#")]
                     n = f.split(".", 1)[0]
                     self._voc_cache[lang2][n] = flatten_list(lines)
+                    self._compile_voc(lang2, n)
+
+    def _compile_voc(self, lang: str, voc_name: str):
+        """precompile a vocabulary into an exact match set and a single regex
+
+        the regex is a word boundary alternation of all phrases, longest first,
+        so checking if an utterance contains any phrase is a single scan"""
+        phrases = {i.strip().lower() for i in self._voc_cache[lang][voc_name] if i.strip()}
+        self._voc_exact[lang][voc_name] = phrases
+        if phrases:
+            alternation = "|".join(re.escape(i) for i in sorted(phrases, key=len, reverse=True))
+            self._voc_regex[lang][voc_name] = re.compile(r'\b(?:' + alternation + r')\b', re.IGNORECASE)
 
     @staticmethod
     def get_active_skills(message: Optional[Message] = None) -> List[str]:
@@ -81,68 +102,40 @@ class StopService(ConfidenceMatcherPipeline):
 
         Notes:
             - Excludes skills that are blacklisted in the current session
-            - Uses a non-blocking event mechanism to collect skill responses
-            - Waits up to 0.5 seconds for skills to respond
+            - Pongs are routed to this request by the correlation id in the ping context
+            - Skills that recently did not answer a ping in this session are not pinged again
+            - Waits up to "ping_timeout" (default 0.5) seconds for skills to respond
             - Falls back to all active skills if no explicit stop confirmation is received
         """
         sess = SessionManager.get(message)
 
-        want_stop = []
-        skill_ids = []
-
         active_skills = [s for s in self.get_active_skills(message)
                          if s not in sess.blacklisted_skills]
 
         if not active_skills:
-            return want_stop
-
-        event = Event()
-
-        def handle_ack(msg):
-            """
-            Handle acknowledgment from skills during the stop process.
-
-            This method is a nested function used in skill stopping negotiation. It validates and tracks skill responses to a stop request.
+            return []
 
-            Parameters:
-                msg (Message): Message containing skill acknowledgment details.
+        # skills that recently didn't answer would only make us wait for the full timeout again
+        ping_skills = [s for s in active_skills if not self.unresponsive.is_unresponsive(sess, s)]
+        if not ping_skills:
+            return active_skills
 
-            Side Effects:
-                - Modifies the `want_stop` list with skills that can handle stopping
-                - Updates the `skill_ids` list to track which skills have responded
-                - Sets the threading event when all active skills have responded
-
-            Notes:
-                - Checks if a skill can handle stopping based on multiple conditions
-                - Ensures all active skills provide a response before proceeding
-            """
-            nonlocal event, skill_ids
-            skill_id = msg.data["skill_id"]
-
-            # validate the stop pong
-            if all((skill_id not in want_stop,
-                    msg.data.get("can_handle", True),
-                    skill_id in active_skills)):
-                want_stop.append(skill_id)
-
-            if skill_id not in skill_ids:  # track which answer we got
-                skill_ids.append(skill_id)
-
-            if all(s in skill_ids for s in active_skills):
-                # all skills answered the ping!
-                event.set()
-
-        self.bus.on("skill.stop.pong", handle_ack)
+        ping = self.pings.open("skill.stop.pong", sess.session_id, ping_skills)
 
         # ask skills if they can stop
-        for skill_id in active_skills:
-            self.bus.emit(message.forward(f"{skill_id}.stop.ping",
-                                          {"skill_id": skill_id}))
+        for skill_id in ping_skills:
+            self.bus.emit(Message(f"{skill_id}.stop.ping", {"skill_id": skill_id},
+                                  ping.context(message)))
 
         # wait for all skills to acknowledge they can stop
-        event.wait(timeout=0.5)
-
-        self.bus.remove("skill.stop.pong", handle_ack)
+        ping.wait_for(lambda: len(ping.answers) == len(ping.skill_ids),
+                      timeout=self.config.get("ping_timeout", 0.5))
+        self.pings.close(ping)
+
+        for skill_id in ping_skills:
+            if skill_id not in ping.answers:
+                self.unresponsive.add(sess, skill_id)
+        want_stop = [s for s in ping_skills if ping.answers.get(s)]
         return want_stop or active_skills
 
     def handle_stop_confirmation(self, message: Message):
@@ -333,8 +326,8 @@ class StopService(ConfidenceMatcherPipeline):
 
     def _get_closest_lang(self, lang: str) -> Optional[str]:
         if self._voc_cache:
-            lang = standardize_lang_tag(lang)
-            closest, score = closest_match(lang, list(self._voc_cache.keys()))
+            lang = standardize_lang(lang)
+            closest, score = closest_lang(lang, tuple(self._voc_cache))
             # https://langcodes-hickford.readthedocs.io/en/sphinx/index.html#distance-values
             # 0 -> These codes represent the same language, possibly after filling in values and normalizing.
             # 1- 3 -> These codes indicate a minor regional difference.
@@ -374,19 +367,17 @@ class StopService(ConfidenceMatcherPipeline):
         if lang is None:  # no vocs registered for this lang
             return False
 
-        _vocs = self._voc_cache[lang].get(voc_filename) or []
-
-        if utt and _vocs:
+        if utt and self._voc_exact[lang].get(voc_filename):
             if exact:
                 # Check for exact match
-                return any(i.strip().lower() == utt.lower()
-                           for i in _vocs)
+                return utt.lower() in self._voc_exact[lang][voc_filename]
             else:
                 # Check for matches against complete words
-                return any([re.match(r'.*\b' + i + r'\b.*', utt, re.IGNORECASE)
-                            for i in _vocs])
+                return bool(self._voc_regex[lang][voc_filename].search(utt))
         return False
 
     def shutdown(self):
+        self.pings.shutdown()
+        self.unresponsive.shutdown()
         self.bus.remove("stop:global", self.handle_global_stop)
         self.bus.remove("stop:skill", self.handle_skill_stop)
\ No newline at end of file
@@ -14,8 +14,11 @@
 #
 """Load, update and manage skills on this device."""
 import os
+import sys
 import threading
-from threading import Thread, Event
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from threading import Thread, Event, Lock
 
 from ovos_bus_client.apis.enclosure import EnclosureAPI
 from ovos_bus_client.client import MessageBusClient
@@ -28,8 +31,13 @@ from ovos_utils.gui import is_gui_connected
 from ovos_utils.log import LOG
 from ovos_utils.network_utils import is_connected_http
 from ovos_utils.process_utils import ProcessStatus, StatusCallbackMap, ProcessState
+from ovos_utils.thread_utils import create_daemon
 from ovos_workshop.skill_launcher import PluginSkillLoader
 from ovos_core.skill_installer import SkillsStore
+from ovos_core.skill_manifest import RecordingBus, SkillManifest, get_skill_version
+from ovos_core.skill_stats import SkillStats
+from ovos_core.skill_worker import IsolatedSkillLoader, SkillWorkerProcess
+from ovos_core.startup_profiler import profiler
 from ovos_core.intent_services import IntentService
 from ovos_workshop.skills.api import SkillApi
 
@@ -56,6 +64,93 @@ def on_stopping():
     LOG.info('Skills Manager is shutting down...')
 
 
+class SkillPluginIndex:
+    """Cached find_skill_plugins() results.
+
+    Scanning the entry points of every installed distribution is expensive, the scan
+    is only repeated when a sys.path directory changed (a distribution was installed,
+    upgraded or removed) or after invalidate() was called
+    """
+
+    def __init__(self):
+        self._plugins = None
+        self._signature = None
+        self._lock = Lock()
+
+    @staticmethod
+    def _path_signature():
+        """mtimes of the sys.path entries, dist-info directories are added/removed in these"""
+        signature = []
+        for path in sys.path:
+            try:
+                signature.append((path, os.stat(path or ".").st_mtime_ns))
+            except OSError:
+                signature.append((path, None))
+        return tuple(signature)
+
+    def invalidate(self):
+        """Force a rescan on the next get()"""
+        with self._lock:
+            self._plugins = None
+
+    def get(self):
+        """Get the installed skill plugins.
+
+        Returns:
+            dict: skill_id: skill plugin class
+        """
+        signature = self._path_signature()
+        with self._lock:
+            if self._plugins is None or signature != self._signature:
+                with profiler.span("find_skill_plugins", "discovery"):
+                    self._plugins = find_skill_plugins()
+                self._signature = signature
+            return dict(self._plugins)
+
+
+class PackagesWatcher:
+    """Watch site-packages directories for python distributions being installed or removed.
+
+    Only the top level of each directory is watched, pip creates or deletes
+    a .dist-info directory there for every distribution it (un)installs
+    """
+    PATTERNS = (".dist-info", ".egg-info", ".egg-link", ".pth")
+
+    def __init__(self, paths, callback):
+        from watchdog.observers import Observer
+        self._callback = callback
+        self.observer = Observer()
+        for path in paths:
+            self.observer.schedule(self, path, recursive=False)
+        self.observer.start()
+
+    @staticmethod
+    def site_packages():
+        """Get the site-packages directories in sys.path.
+
+        Returns:
+            list: existing site-packages/dist-packages directories
+        """
+        return [p for p in sys.path if os.path.basename(p) in ("site-packages", "dist-packages")
+                and os.path.isdir(p)]
+
+    def dispatch(self, event):
+        """called by the watchdog observer for every file system event"""
+        for path in (event.src_path, getattr(event, "dest_path", "")):
+            if isinstance(path, bytes):
+                path = path.decode()
+            if path and path.rstrip("/").endswith(self.PATTERNS):
+                try:
+                    self._callback(path)
+                except Exception:
+                    LOG.exception("An error occurred handling package change event callback")
+                return
+
+    def shutdown(self):
+        self.observer.unschedule_all()
+        self.observer.stop()
+
+
 class SkillManager(Thread):
     """Manages the loading, activation, and deactivation of Mycroft skills."""
 
@@ -80,8 +175,10 @@ class SkillManager(Thread):
         super(SkillManager, self).__init__()
         self.bus = bus
         self._settings_watchdog = None
+        self._packages_watcher = None
         # Set watchdog to argument or function returning None
         self._watchdog = watchdog or (lambda: None)
+        self._has_watchdog = watchdog is not None
         callbacks = StatusCallbackMap(on_started=started_hook,
                                       on_alive=alive_hook,
                                       on_ready=ready_hook,
@@ -97,10 +194,12 @@ class SkillManager(Thread):
         self._gui_event = Event()
         self._network_loaded = Event()
         self._internet_loaded = Event()
+        self._discovery_event = Event()  # installed packages changed, look for new skills
         self._network_skill_timeout = 300
         self._allow_state_reloads = True
         self._logged_skill_warnings = list()
-        self._detected_installed_skills = bool(find_skill_plugins())
+        self._plugin_index = SkillPluginIndex()
+        self._detected_installed_skills = bool(self._plugin_index.get())
         if not self._detected_installed_skills:
             LOG.warning(
                 "No installed skills detected! if you are running skills in standalone mode ignore this warning,"
@@ -109,6 +208,22 @@ class SkillManager(Thread):
         self.config = Configuration()
 
         self.plugin_skills = {}
+        self.skill_load_times = {}  # skill_id: seconds spent in the skill constructor
+        self._priority_loaded = Event()
+        # skills (un)loaded since the last intent training
+        self._pending_training = {"loaded": set(), "unloaded": set()}
+        self._pending_training_lock = Lock()
+        self._train_lock = Lock()
+        # skills registered from their intent manifest, instantiated on first use
+        self.lazy_skills = {}  # skill_id: {"plugin", "manifest", "last_used"}
+        self._lazy_triggers = {}  # msg_type: skill_id
+        self._lazy_fallback_ping = False
+        self._lazy_idle_thread = None
+        self._lazy_lock = threading.RLock()
+        self.resource_stats = SkillStats(self.skills_config.get("resource_stats"))
+        self.skill_workers = {}  # worker name: SkillWorkerProcess, skills running in other processes
+        self._workers_lock = Lock()
+        self._workers_supervisor = None
         self.enclosure = EnclosureAPI(bus)
         self.num_install_retries = 0
         self.empty_skill_dirs = set()  # Save a record of empty skill dirs.
@@ -119,12 +234,15 @@ class SkillManager(Thread):
         self.status.bind(self.bus)
 
         # init subsystems
-        self.osm = SkillsStore(self.bus) if enable_installer else None
-        self.event_scheduler = EventScheduler(self.bus, autostart=False) if enable_event_scheduler else None
-        if self.event_scheduler:
-            self.event_scheduler.daemon = True # TODO - add kwarg in EventScheduler
-            self.event_scheduler.start()
-        self.intents = IntentService(self.bus) if enable_intent_service else None
+        with profiler.span("SkillsStore.__init__"):
+            self.osm = SkillsStore(self.bus) if enable_installer else None
+        with profiler.span("EventScheduler.__init__"):
+            self.event_scheduler = EventScheduler(self.bus, autostart=False) if enable_event_scheduler else None
+            if self.event_scheduler:
+                self.event_scheduler.daemon = True # TODO - add kwarg in EventScheduler
+                self.event_scheduler.start()
+        with profiler.span("IntentService.__init__"):
+            self.intents = IntentService(self.bus) if enable_intent_service else None
         if enable_skill_api:
             SkillApi.connect_bus(self.bus)
         if enable_file_watcher:
@@ -191,6 +309,7 @@ class SkillManager(Thread):
         self.bus.on('skillmanager.deactivate', self.deactivate_skill)
         self.bus.on('skillmanager.keep', self.deactivate_except)
         self.bus.on('skillmanager.activate', self.activate_skill)
+        self.bus.on('skillmanager.stats', self.send_skill_stats)
 
         # Load skills waiting for connectivity
         self.bus.on("mycroft.network.connected", self.handle_network_connected)
@@ -200,6 +319,11 @@ class SkillManager(Thread):
         self.bus.on("mycroft.internet.disconnected", self.handle_internet_disconnected)
         self.bus.on("mycroft.gui.unavailable", self.handle_gui_disconnected)
 
+        # installed packages changed, rescan skill plugins
+        self.bus.on("ovos.skills.install.complete", self.handle_packages_changed)
+        self.bus.on("ovos.pip.install.complete", self.handle_packages_changed)
+        self.bus.on("ovos.pip.uninstall.complete", self.handle_packages_changed)
+
     @property
     def skills_config(self):
         """Get the skills service configuration.
@@ -209,6 +333,35 @@ class SkillManager(Thread):
         """
         return self.config['skills']
 
+    def handle_packages_changed(self, message):
+        """Handle python packages being installed or removed by the SkillsStore.
+
+        Args:
+            message: Message reporting the completed install/uninstall.
+        """
+        self._plugin_index.invalidate()
+        self._discovery_event.set()
+
+    def _init_packages_watcher(self):
+        """Watch site-packages so newly installed skills are loaded right away."""
+        paths = PackagesWatcher.site_packages()
+        if not paths or not self.skills_config.get("watch_packages", True):
+            return
+        try:
+            self._packages_watcher = PackagesWatcher(paths, self._handle_package_change)
+        except Exception as e:  # eg. inotify watch limit reached
+            LOG.warning(f"Failed to watch site-packages, falling back to polling: {e}")
+
+    def _handle_package_change(self, path: str):
+        """Handle a distribution being installed or removed outside of the SkillsStore.
+
+        Args:
+            path (str): Path of the changed distribution metadata.
+        """
+        LOG.debug(f"python package change detected: {path}")
+        self._plugin_index.invalidate()
+        self._discovery_event.set()
+
     def handle_gui_connected(self, message):
         """Handle GUI connection event.
 
@@ -282,12 +435,13 @@ class SkillManager(Thread):
             network (bool): Network connection status.
             internet (bool): Internet connection status.
         """
-        loaded_new = False
+        lazy_registered = False
         if network is None:
             network = self._network_event.is_set()
         if internet is None:
             internet = self._connected_event.is_set()
-        plugins = find_skill_plugins()
+        plugins = self._plugin_index.get()
+        to_load = {}
         for skill_id, plug in plugins.items():
             if skill_id in self.blacklist:
                 if skill_id not in self._logged_skill_warnings:
@@ -295,7 +449,7 @@ class SkillManager(Thread):
                     LOG.warning(f"{skill_id} is blacklisted, it will NOT be loaded")
                     LOG.info(f"Consider uninstalling {skill_id} instead of blacklisting it")
                 continue
-            if skill_id not in self.plugin_skills:
+            if skill_id not in self.plugin_skills and skill_id not in self.lazy_skills:
                 skill_loader = self._get_plugin_skill_loader(skill_id, init_bus=False,
                                                              skill_class=plug)
                 requirements = skill_loader.runtime_requirements
@@ -303,9 +457,202 @@ class SkillManager(Thread):
                     continue
                 if not internet and requirements.internet_before_load:
                     continue
+                if skill_id in self.lazy_skill_ids:
+                    manifest = SkillManifest.load(skill_id, get_skill_version(plug))
+                    if manifest:  # register intents now, instantiate the skill when needed
+                        self._register_lazy_skill(skill_id, plug, manifest)
+                        lazy_registered = True
+                        continue
+                to_load[skill_id] = plug
+
+        # priority skills are loaded first
+        priority = self.skills_config.get("priority_skills") or []
+        to_load = dict(sorted(to_load.items(),
+                              key=lambda i: priority.index(i[0]) if i[0] in priority else len(priority)))
+        if self.skills_config.get("parallel_loading") and len(to_load) > 1:
+            self._load_plugin_skills_parallel(to_load, plugins)
+        else:
+            for skill_id, plug in to_load.items():
                 self._load_plugin_skill(skill_id, plug)
-                loaded_new = True
-        return loaded_new
+                self._check_priority_loaded(plugins)
+        return bool(to_load) or lazy_registered
+
+    @property
+    def lazy_skill_ids(self):
+        """Get the skill_ids that should only be instantiated when needed.
+
+        Returns:
+            list: skill_ids from "skills": {"lazy_skills": [...]}
+        """
+        return self.skills_config.get("lazy_skills") or []
+
+    def _register_lazy_skill(self, skill_id, skill_plugin, manifest, loaded=False):
+        """Register a skill from its manifest, it is instantiated on first use.
+
+        Args:
+            skill_id (str): ID of the skill.
+            skill_plugin: Plugin skill class.
+            manifest (SkillManifest): recorded registration messages of the skill.
+            loaded (bool): the skill is already instantiated, only track usage
+        """
+        with self._lazy_lock:
+            self.lazy_skills[skill_id] = {"plugin": skill_plugin,
+                                          "manifest": manifest,
+                                          "last_used": time.monotonic()}
+            triggers = manifest.intents + [f"{skill_id}.converse.request",
+                                           f"ovos.skills.fallback.{skill_id}.request"]
+            for msg_type in triggers:
+                if msg_type not in self._lazy_triggers:
+                    self.bus.on(msg_type, self._handle_lazy_trigger)
+                self._lazy_triggers[msg_type] = skill_id
+            if manifest.fallback_priority is not None and not self._lazy_fallback_ping:
+                self._lazy_fallback_ping = True
+                self.bus.on("ovos.skills.fallback.ping", self._handle_lazy_fallback_ping)
+            if self.skills_config.get("lazy_idle_timeout") and not self._lazy_idle_thread:
+                self._lazy_idle_thread = create_daemon(self._unload_idle_skills)
+        if not loaded:
+            LOG.info(f"Registered {skill_id} from manifest, it will be loaded on first use")
+            self._replay_manifest(manifest)
+
+    def _replay_manifest(self, manifest):
+        """Emit the recorded registration messages of a skill.
+
+        Args:
+            manifest (SkillManifest): recorded registration messages of the skill.
+        """
+        for message in manifest.messages:
+            self.bus.emit(Message(message.msg_type, dict(message.data), dict(message.context)))
+        with self._pending_training_lock:
+            self._pending_training["loaded"].add(manifest.skill_id)
+            self._pending_training["unloaded"].discard(manifest.skill_id)
+
+    def _instantiate_lazy_skill(self, skill_id):
+        """Instantiate a skill that was registered from its manifest.
+
+        Args:
+            skill_id (str): ID of the skill.
+
+        Returns:
+            bool: True if the skill was instantiated now, False if already loaded or failed
+        """
+        with self._lazy_lock:
+            entry = self.lazy_skills.get(skill_id)
+            entry["last_used"] = time.monotonic()
+            if skill_id in self.plugin_skills:
+                return False
+            LOG.info(f"Loading {skill_id} on demand")
+            loaded = self._load_plugin_skill(skill_id, entry["plugin"]) is not None
+            with self._pending_training_lock:  # intents are already registered from the manifest
+                self._pending_training["loaded"].discard(skill_id)
+            return loaded
+
+    def _handle_lazy_trigger(self, message):
+        """Handle a message targeting a lazy skill, eg. one of its intents matched.
+
+        Args:
+            message: Message that needs the skill instance.
+        """
+        skill_id = self._lazy_triggers.get(message.msg_type)
+        if skill_id and self._instantiate_lazy_skill(skill_id):
+            # the skill was not listening yet, deliver the message again
+            self.bus.emit(message)
+
+    def _handle_lazy_fallback_ping(self, message):
+        """Instantiate lazy fallback skills in the pinged range, they need to answer if they can handle the utterance.
+
+        Args:
+            message: 'ovos.skills.fallback.ping' Message.
+        """
+        start, stop = message.data.get("range") or (0, 101)
+        for skill_id, entry in list(self.lazy_skills.items()):
+            priority = entry["manifest"].fallback_priority
+            if priority is None or skill_id in self.plugin_skills or not start < priority <= stop:
+                continue
+            if not self._instantiate_lazy_skill(skill_id):
+                continue
+            # the skill was not listening yet, only it needs to answer, the loaded skills already did
+            instance = getattr(self.plugin_skills.get(skill_id), "instance", None)
+            if instance is not None and hasattr(instance, "_handle_fallback_ack"):
+                instance._handle_fallback_ack(message)
+            else:  # runs in a worker process, it answers from the next ping on
+                LOG.debug(f"{skill_id} can not answer the current fallback ping")
+
+    def _unload_idle_skills(self):
+        """Unload lazy skills that were not used for "lazy_idle_timeout" seconds."""
+        while not self._stop_event.is_set():
+            timeout = self.skills_config.get("lazy_idle_timeout") or 0
+            if self._stop_event.wait(min(timeout, 60) if timeout else 60) or not timeout:
+                continue
+            unloaded = False
+            for skill_id, entry in list(self.lazy_skills.items()):
+                with self._lazy_lock:
+                    if skill_id not in self.plugin_skills or \
+                            time.monotonic() - entry["last_used"] < timeout:
+                        continue
+                    LOG.info(f"Unloading idle skill: {skill_id}")
+                    self._unload_plugin_skill(skill_id)
+                # shutdown detached the skill intents, register them again
+                self._replay_manifest(entry["manifest"])
+                unloaded = True
+            if unloaded:
+                self._train_intents()
+
+    def get_skill_dependencies(self, skill_id):
+        """Get the skill_ids that need to be loaded before a skill, used by parallel loading
+
+        defined in mycroft.conf, "skills": {"skill_dependencies": {"skill_id": ["other_skill_id"]}}
+
+        Args:
+            skill_id (str): ID of the skill.
+
+        Returns:
+            list: skill_ids to load before this skill
+        """
+        return self.skills_config.get("skill_dependencies", {}).get(skill_id) or []
+
+    def _load_plugin_skills_parallel(self, to_load, installed):
+        """Load plugin skills in a thread pool, respecting skill dependencies.
+
+        Args:
+            to_load (dict): skill_id: skill plugin, in load order
+            installed (dict): all installed skill plugins
+        """
+        pending = dict(to_load)
+        running = {}  # future: skill_id
+        workers = self.skills_config.get("load_workers", 4)
+        LOG.info(f"Loading {len(pending)} skills with {workers} workers")
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="SkillLoader") as executor:
+            while pending or running:
+                # dependencies not being loaded in this batch are assumed to be satisfied
+                ready = [skill_id for skill_id in pending
+                         if not any(dep in pending or dep in running.values()
+                                    for dep in self.get_skill_dependencies(skill_id))]
+                if not ready and not running:
+                    LOG.warning(f"circular skill dependencies detected, loading anyway: {list(pending)}")
+                    ready = list(pending)
+                for skill_id in ready:
+                    future = executor.submit(self._load_plugin_skill, skill_id, pending.pop(skill_id))
+                    running[future] = skill_id
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    running.pop(future)
+                self._check_priority_loaded(installed)
+
+    def _check_priority_loaded(self, installed):
+        """Emit 'mycroft.skills.priority_loaded' once every installed priority skill finished loading
+
+        Args:
+            installed (dict): all installed skill plugins
+        """
+        if self._priority_loaded.is_set():
+            return
+        priority = [s for s in self.skills_config.get("priority_skills") or []
+                    if s in installed and s not in self.blacklist]
+        if priority and all(s in self.plugin_skills for s in priority):
+            self._priority_loaded.set()
+            self.bus.emit(Message("mycroft.skills.priority_loaded",
+                                  {"skill_ids": priority,
+                                   "load_times": {s: self.skill_load_times.get(s) for s in priority}}))
 
     def _get_internal_skill_bus(self):
         """Get a dedicated skill bus connection per skill.
@@ -336,7 +683,7 @@ class SkillManager(Thread):
         """
         bus = None
         if init_bus:
-            bus = self._get_internal_skill_bus()
+            bus = self.resource_stats.wrap_bus(skill_id, self._get_internal_skill_bus())
         loader = PluginSkillLoader(bus, skill_id)
         if skill_class:
             loader.skill_class = skill_class
@@ -352,19 +699,116 @@ class SkillManager(Thread):
         Returns:
             PluginSkillLoader: Loaded plugin skill loader instance if successful, None otherwise.
         """
+        worker = self._get_skill_worker(skill_id)
+        if worker:
+            return self._load_isolated_skill(worker, skill_id)
         skill_loader = self._get_plugin_skill_loader(skill_id, skill_class=skill_plugin)
+        recorder = None
+        if skill_id in self.lazy_skill_ids and skill_id not in self.lazy_skills:
+            # first load of a lazy skill, record its registration messages
+            recorder = skill_loader.bus = RecordingBus(skill_loader.bus)
+        start = time.perf_counter()
         try:
             load_status = skill_loader.load(skill_plugin)
+            if load_status and recorder:
+                recorder.recording = False
+                manifest = SkillManifest(skill_id, get_skill_version(skill_plugin), recorder.messages)
+                manifest.save()
+                self._register_lazy_skill(skill_id, skill_plugin, manifest, loaded=True)
             if load_status:
+                with self._pending_training_lock:
+                    self._pending_training["loaded"].add(skill_id)
+                    self._pending_training["unloaded"].discard(skill_id)
                 self.bus.emit(Message("mycroft.skill.loaded", {"skill_id": skill_id}))
         except Exception:
             LOG.exception(f'Load of skill {skill_id} failed!')
             load_status = False
         finally:
+            end = time.perf_counter()
+            self.skill_load_times[skill_id] = end - start
+            profiler.add(skill_id, "skill", start, end)
             self.plugin_skills[skill_id] = skill_loader
+            if load_status:
+                self.resource_stats.add_skill(skill_id, skill_plugin, self.skill_load_times[skill_id])
+        LOG.debug(f"{skill_id} load took {self.skill_load_times[skill_id]:.3f}s")
 
         return skill_loader if load_status else None
 
+    def _get_skill_worker(self, skill_id):
+        """Get the worker process a skill should run in.
+
+        Args:
+            skill_id (str): ID of the skill.
+
+        Returns:
+            SkillWorkerProcess: worker from "skills": {"skill_workers": {name: [skill_ids]}},
+                None if the skill runs in the SkillManager process
+        """
+        for name, skill_ids in (self.skills_config.get("skill_workers") or {}).items():
+            if skill_id in skill_ids:
+                with self._workers_lock:
+                    if name not in self.skill_workers:
+                        self.skill_workers[name] = SkillWorkerProcess(
+                            self.bus, name, load_timeout=self.skills_config.get("worker_load_timeout", 60))
+                    if not self._workers_supervisor:
+                        self._workers_supervisor = create_daemon(self._supervise_skill_workers)
+                    return self.skill_workers[name]
+        return None
+
+    def _load_isolated_skill(self, worker, skill_id):
+        """Load a plugin skill in a worker process.
+
+        Args:
+            worker (SkillWorkerProcess): worker the skill runs in.
+            skill_id (str): ID of the skill.
+
+        Returns:
+            IsolatedSkillLoader: loader tracking the skill if successful, None otherwise.
+        """
+        start = time.perf_counter()
+        load_status = worker.load(skill_id)
+        end = time.perf_counter()
+        self.skill_load_times[skill_id] = end - start
+        profiler.add(skill_id, "skill", start, end, worker=worker.name)
+        skill_loader = IsolatedSkillLoader(worker, skill_id)
+        skill_loader.active = load_status
+        self.plugin_skills[skill_id] = skill_loader
+        if not load_status:
+            LOG.error(f"Load of skill {skill_id} in worker '{worker.name}' failed!")
+            return None
+        LOG.info(f"Loaded {skill_id} in worker '{worker.name}'")
+        with self._pending_training_lock:
+            self._pending_training["loaded"].add(skill_id)
+            self._pending_training["unloaded"].discard(skill_id)
+        self.bus.emit(Message("mycroft.skill.loaded", {"skill_id": skill_id}))
+        return skill_loader
+
+    def _supervise_skill_workers(self):
+        """Restart skill worker processes that died."""
+        interval = self.skills_config.get("worker_check_interval", 5)
+        max_restarts = self.skills_config.get("worker_max_restarts", 5)
+        while not self._stop_event.wait(interval):
+            for worker in list(self.skill_workers.values()):
+                if worker.is_alive() or not worker.skill_ids:
+                    continue
+                crashed = set(worker.skill_ids)
+                LOG.error(f"skill worker '{worker.name}' died, affected skills: {crashed}")
+                for skill_id in crashed:  # the skills could not detach themselves
+                    self.bus.emit(Message("detach_skill", {"skill_id": skill_id}))
+                if worker.restarts >= max_restarts:
+                    LOG.error(f"skill worker '{worker.name}' restarted too often, giving up")
+                    worker.skill_ids.clear()
+                    failed = crashed
+                else:
+                    failed = worker.restart()
+                for skill_id in failed:
+                    if skill_id in self.plugin_skills:
+                        self.plugin_skills[skill_id].active = False
+                with self._pending_training_lock:
+                    self._pending_training["loaded"].update(crashed - failed)
+                    self._pending_training["unloaded"].update(failed)
+                self._train_intents()
+
     def wait_for_intent_service(self):
         """ensure IntentService reported ready to accept skill messages"""
         while not self._stop_event.is_set():
@@ -382,13 +826,16 @@ class SkillManager(Thread):
         self.status.set_alive()
 
         LOG.debug("Waiting for IntentService startup")
-        self.wait_for_intent_service()
+        with profiler.span("wait_for_intent_service"):
+            self.wait_for_intent_service()
         LOG.debug("IntentService reported ready")
 
-        self._load_on_startup()
+        with profiler.span("load_offline_skills"):
+            self._load_on_startup()
 
         # trigger a sync so we dont need to wait for the plugin to volunteer info
-        self._sync_skill_loading_state()
+        with profiler.span("sync_skill_loading_state"):
+            self._sync_skill_loading_state()
 
         if not all((self._network_loaded.is_set(),
                     self._internet_loaded.is_set())):
@@ -403,11 +850,31 @@ class SkillManager(Thread):
 
         LOG.info("ovos-core is ready! additional skills can now be loaded")
 
-        # Scan the file folder that contains Skills.  If a Skill is updated,
-        # unload the existing version from memory and reload from the disk.
-        while not self._stop_event.wait(30):
+        if self.resource_stats.limits:
+            create_daemon(self._monitor_resources)
+
+        # new skills are discovered when packages are installed, either reported by
+        # the SkillsStore or by watching site-packages, polling is only a fallback
+        self._init_packages_watcher()
+        default_poll = None if self._packages_watcher else 30
+        poll_interval = self.skills_config.get("discovery_poll_interval", default_poll)
+        debounce = self.skills_config.get("discovery_debounce", 0.5)
+        timeout = poll_interval or None
+        if self._has_watchdog:
+            timeout = min(timeout or 30, 30)
+        last_scan = time.monotonic()
+        while not self._stop_event.is_set():
+            triggered = self._discovery_event.wait(timeout)
+            if self._stop_event.is_set():
+                break
             try:
-                self._load_new_skills()
+                if triggered:
+                    # let the package manager finish writing files
+                    self._stop_event.wait(debounce)
+                    self._discovery_event.clear()
+                if triggered or (poll_interval and time.monotonic() - last_scan >= poll_interval):
+                    last_scan = time.monotonic()
+                    self._load_new_skills()
                 self._watchdog()
             except Exception:
                 LOG.exception('Something really unexpected has occurred '
@@ -465,19 +932,41 @@ class SkillManager(Thread):
         loaded_new = self.load_plugin_skills(network=network, internet=internet)
 
         if loaded_new:
-            LOG.debug("Requesting pipeline intent training")
-            try:
-                response = self.bus.wait_for_response(Message("mycroft.skills.train"),
-                                                      "mycroft.skills.trained",
-                                                      timeout=60)  # 60 second timeout
-                if not response:
-                    LOG.error("Intent training timed out")
-                elif response.data.get('error'):
-                    LOG.error(f"Intent training failed: {response.data['error']}")
-                else:
-                    LOG.debug(f"pipelines trained and ready to go")
-            except Exception as e:
-                LOG.exception(f"Error during Intent training: {e}")
+            if self.status.state == ProcessState.READY:
+                # hot loading skills, existing intents remain usable while training
+                create_daemon(self._train_intents)
+            else:
+                self._train_intents()
+
+    def _train_intents(self):
+        """Request intent training for the skills (un)loaded since the last training.
+
+        'mycroft.skills.train' includes the affected skill_ids, pipelines that support it
+        can retrain only the intents of those skills, others just retrain everything
+        """
+        with self._train_lock:  # a single training round at a time
+            with self._pending_training_lock:
+                skill_ids = sorted(self._pending_training["loaded"])
+                removed_skill_ids = sorted(self._pending_training["unloaded"])
+                self._pending_training = {"loaded": set(), "unloaded": set()}
+            if not skill_ids and not removed_skill_ids:
+                return
+            LOG.debug(f"Requesting pipeline intent training for: {skill_ids}")
+            with profiler.span("train_intents", "training", skill_ids=skill_ids):
+                try:
+                    response = self.bus.wait_for_response(
+                        Message("mycroft.skills.train", {"skill_ids": skill_ids,
+                                                         "removed_skill_ids": removed_skill_ids}),
+                        "mycroft.skills.trained",
+                        timeout=60)  # 60 second timeout
+                    if not response:
+                        LOG.error("Intent training timed out")
+                    elif response.data.get('error'):
+                        LOG.error(f"Intent training failed: {response.data['error']}")
+                    else:
+                        LOG.debug(f"pipelines trained and ready to go")
+                except Exception as e:
+                    LOG.exception(f"Error during Intent training: {e}")
 
     def _unload_plugin_skill(self, skill_id):
         """Unload a plugin skill.
@@ -497,7 +986,13 @@ class SkillManager(Thread):
                     skill_loader.instance.default_shutdown()
                 except Exception:
                     LOG.exception('Failed to shutdown skill: ' + skill_loader.skill_id)
+            if isinstance(skill_loader, IsolatedSkillLoader):
+                skill_loader.deactivate()
             self.plugin_skills.pop(skill_id)
+            self.resource_stats.remove_skill(skill_id)
+            with self._pending_training_lock:
+                self._pending_training["loaded"].discard(skill_id)
+                self._pending_training["unloaded"].add(skill_id)
 
     def is_alive(self, message=None):
         """Respond to is_alive status request."""
@@ -522,6 +1017,29 @@ class SkillManager(Thread):
         except Exception:
             LOG.exception('Failed to send skill list')
 
+    def send_skill_stats(self, message):
+        """Send resource usage of loaded skills."""
+        try:
+            self.bus.emit(message.response(self.resource_stats.sample()))
+        except Exception:
+            LOG.exception('Failed to send skill stats')
+
+    def _monitor_resources(self):
+        """Periodically check skills against the configured resource limits."""
+        while not self._stop_event.wait(self.resource_stats.interval):
+            try:
+                offenders = self.resource_stats.check_limits(self.resource_stats.sample("monitor"))
+                if self.resource_stats.config.get("limit_action", "log") != "deactivate":
+                    continue
+                for skill_id in offenders:
+                    skill_loader = self.plugin_skills.get(skill_id)
+                    if skill_loader and skill_loader.active:
+                        LOG.warning(f"Deactivating (unloading) skill over resource limits: {skill_id}")
+                        skill_loader.deactivate()
+                        self.resource_stats.remove_skill(skill_id)
+            except Exception:
+                LOG.exception('Failed to check skill resource limits')
+
     def deactivate_skill(self, message):
         """Deactivate a skill."""
         try:
@@ -572,6 +1090,7 @@ class SkillManager(Thread):
         """Tell the manager to shutdown."""
         self.status.set_stopping()
         self._stop_event.set()
+        self._discovery_event.set()  # wake up the discovery loop
 
         # Do a clean shutdown of all skills
         for skill_id in list(self.plugin_skills.keys()):
@@ -599,3 +1118,14 @@ class SkillManager(Thread):
                 self._settings_watchdog.shutdown()
             except Exception as e:
                 LOG.error(f"Failed to cleanly unload settings watchdog ({e})")
+        self.resource_stats.shutdown()
+        for worker in list(self.skill_workers.values()):
+            try:
+                worker.stop()
+            except Exception as e:
+                LOG.error(f"Failed to cleanly stop skill worker '{worker.name}' ({e})")
+        if self._packages_watcher:
+            try:
+                self._packages_watcher.shutdown()
+            except Exception as e:
+                LOG.error(f"Failed to cleanly unload packages watcher ({e})")
@@ -0,0 +1,130 @@
+"""intent manifests, allow skills to be registered without instantiating them
+
+the registration messages a skill emits while loading are recorded the first time it is loaded,
+replaying them registers the skill intents, vocab and fallback with the pipelines,
+the skill itself is only instantiated once one of those is actually needed
+"""
+import inspect
+import json
+import os
+from functools import lru_cache
+from importlib import metadata
+from typing import List, Optional
+
+from ovos_bus_client.message import Message
+from ovos_config.locations import get_xdg_cache_save_path
+from ovos_utils.log import LOG
+
+# messages a skill emits at load time to register itself with the intent pipelines, OCP and homescreen
+REGISTRATION_MESSAGES = ("register_vocab",
+                         "register_intent",
+                         "padatious:register_intent",
+                         "padatious:register_entity",
+                         "ovos.skills.fallback.register",
+                         "ovos.common_play.register_keyword")
+# message types starting with these are registrations too, eg. homescreen.register.app
+REGISTRATION_PREFIXES = ("homescreen.register.",)
+
+
+def is_registration_message(msg_type: str) -> bool:
+    """True if a skill emitting this message type at load time is registering itself"""
+    return msg_type in REGISTRATION_MESSAGES or msg_type.startswith(REGISTRATION_PREFIXES)
+
+
+@lru_cache()
+def _packages_distributions() -> dict:
+    if not hasattr(metadata, "packages_distributions"):  # python < 3.10
+        return {}
+    return metadata.packages_distributions()
+
+
+def get_skill_version(skill_class) -> str:
+    """version of the distribution providing a skill plugin
+
+    falls back to the modification time of the skill module if the distribution is unknown
+    """
+    module = inspect.getmodule(skill_class)
+    if module is not None:
+        top_level = module.__name__.split(".")[0]
+        if top_level not in _packages_distributions():  # maybe installed after the cache was built
+            _packages_distributions.cache_clear()
+        for dist in _packages_distributions().get(top_level, []):
+            try:
+                return metadata.version(dist)
+            except metadata.PackageNotFoundError:
+                continue
+        path = getattr(module, "__file__", None)
+        if path and os.path.isfile(path):
+            return f"mtime-{os.path.getmtime(path)}"
+    return "unknown"
+
+
+class RecordingBus:
+    """wraps the bus given to a skill, recording its registration messages while loading"""
+
+    def __init__(self, bus):
+        self._bus = bus
+        self.recording = True
+        self.messages: List[Message] = []
+
+    def emit(self, message: Message, *args, **kwargs):
+        if self.recording and is_registration_message(message.msg_type):
+            self.messages.append(Message(message.msg_type, dict(message.data), dict(message.context)))
+        return self._bus.emit(message, *args, **kwargs)
+
+    def __getattr__(self, item):
+        return getattr(self._bus, item)
+
+
+class SkillManifest:
+    """registration data of a skill, cached on disk per skill version"""
+
+    def __init__(self, skill_id: str, version: str, messages: List[Message]):
+        self.skill_id = skill_id
+        self.version = version
+        self.messages = messages
+
+    @property
+    def intents(self) -> List[str]:
+        """intent names, the msg_type IntentService emits when they match"""
+        return [m.data["name"] for m in self.messages
+                if m.msg_type in ("register_intent", "padatious:register_intent")
+                and m.data.get("name")]
+
+    @property
+    def fallback_priority(self) -> Optional[int]:
+        for m in self.messages:
+            if m.msg_type == "ovos.skills.fallback.register":
+                return m.data.get("priority") or 101
+        return None
+
+    @staticmethod
+    def path(skill_id: str) -> str:
+        return os.path.join(get_xdg_cache_save_path(), "skill_manifests", f"{skill_id}.json")
+
+    def save(self):
+        path = self.path(self.skill_id)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"skill_id": self.skill_id,
+                       "version": self.version,
+                       "messages": [json.loads(m.serialize()) for m in self.messages]}, f)
+
+    @classmethod
+    def load(cls, skill_id: str, version: str) -> Optional["SkillManifest"]:
+        """cached manifest for this skill version, None if missing or outdated"""
+        path = cls.path(skill_id)
+        if not os.path.isfile(path):
+            return None
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except Exception as e:
+            LOG.warning(f"Invalid skill manifest {path}: {e}")
+            return None
+        if data.get("version") != version:
+            LOG.debug(f"{skill_id} manifest is outdated")
+            return None
+        messages = [Message(m["type"], m.get("data", {}), m.get("context", {}))
+                    for m in data.get("messages", [])]
+        return cls(skill_id, version, messages)
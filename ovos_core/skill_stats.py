@@ -0,0 +1,215 @@
+"""per skill resource accounting, all skills share the SkillManager process
+
+memory is attributed by the source file that allocated it (tracemalloc),
+CPU time is measured around the bus handlers a skill registers,
+threads are attributed by the module of their target
+"""
+import inspect
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from threading import Lock
+from typing import Dict, List, Optional, Tuple
+
+from ovos_utils.log import LOG
+
+
+def _skill_module(skill_class) -> Tuple[Optional[str], Optional[str]]:
+    """top level module name and source path (package dir or module file) of a skill plugin"""
+    module = inspect.getmodule(skill_class)
+    if module is None:
+        return None, None
+    top_level = module.__name__.split(".")[0]
+    top_module = sys.modules.get(top_level)
+    path = getattr(top_module, "__file__", None)
+    if path and hasattr(top_module, "__path__"):  # package, attribute everything below it
+        path = os.path.dirname(path)
+    return top_level, path
+
+
+class StatsBus:
+    """wraps the bus given to a skill, measuring CPU time spent in the handlers it registers"""
+
+    def __init__(self, bus, skill_stats: "SkillStats", skill_id: str):
+        self._bus = bus
+        self._stats = skill_stats
+        self._skill_id = skill_id
+        # bound methods are created on every attribute access, compare handlers by equality not identity
+        self._wrappers = {}  # (msg_type, handler): wrapper
+
+    def _wrap(self, msg_type, handler):
+        def wrapper(*args, **kwargs):
+            start = time.thread_time()
+            try:
+                return handler(*args, **kwargs)
+            finally:
+                self._stats.add_handler_time(self._skill_id, msg_type, time.thread_time() - start)
+
+        self._wrappers[(msg_type, handler)] = wrapper
+        return wrapper
+
+    def on(self, msg_type, handler):
+        return self._bus.on(msg_type, self._wrap(msg_type, handler))
+
+    def once(self, msg_type, handler):
+        return self._bus.once(msg_type, self._wrap(msg_type, handler))
+
+    def remove(self, msg_type, handler):
+        wrapper = self._wrappers.pop((msg_type, handler), handler)
+        return self._bus.remove(msg_type, wrapper)
+
+    def remove_all_listeners(self, msg_type):
+        for key in [k for k in self._wrappers if k[0] == msg_type]:
+            self._wrappers.pop(key)
+        return self._bus.remove_all_listeners(msg_type)
+
+    def __getattr__(self, item):
+        return getattr(self._bus, item)
+
+
+class SkillStats:
+    """collect resource usage per skill and enforce soft limits
+
+    config, under "skills": {"resource_stats": {...}}
+        "enabled": measure handler CPU time, wraps the skill bus
+        "trace_memory": attribute allocations with tracemalloc, has a noticeable overhead
+        "interval": seconds between samples checked against the limits
+        "limits": {"memory_mb": 0, "cpu_percent": 0, "threads": 0}, 0 means no limit
+        "limit_action": "log" or "deactivate"
+    """
+
+    def __init__(self, config: Optional[dict] = None):
+        self.config = config or {}
+        self._lock = Lock()
+        self._skills: Dict[str, dict] = {}  # skill_id: {"module", "path", "load_time"}
+        self._handlers: Dict[str, Dict[str, List[float]]] = {}  # skill_id: {msg_type: [calls, cpu_time]}
+        # baseline: {skill_id: (monotonic, cpu_time)}, cpu_percent is measured since the previous
+        # sample of the same baseline, so bus queries don't reset the window of the limits monitor
+        self._last_sample: Dict[str, Dict[str, Tuple[float, float]]] = {}
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.config.get("enabled"))
+
+    @property
+    def trace_memory(self) -> bool:
+        return bool(self.config.get("trace_memory"))
+
+    @property
+    def interval(self) -> float:
+        return self.config.get("interval", 60)
+
+    @property
+    def limits(self) -> dict:
+        return {k: v for k, v in (self.config.get("limits") or {}).items() if v}
+
+    def wrap_bus(self, skill_id: str, bus):
+        """bus for a skill, accounting its handlers CPU time if enabled"""
+        if not self.enabled or bus is None:
+            return bus
+        return StatsBus(bus, self, skill_id)
+
+    def add_skill(self, skill_id: str, skill_class, load_time: float):
+        module, path = _skill_module(skill_class)
+        with self._lock:
+            self._skills[skill_id] = {"module": module, "path": path, "load_time": load_time}
+
+    def remove_skill(self, skill_id: str):
+        with self._lock:
+            self._skills.pop(skill_id, None)
+            self._handlers.pop(skill_id, None)
+            for samples in self._last_sample.values():
+                samples.pop(skill_id, None)
+
+    def add_handler_time(self, skill_id: str, msg_type: str, cpu_time: float):
+        with self._lock:
+            handler = self._handlers.setdefault(skill_id, {}).setdefault(msg_type, [0, 0.0])
+            handler[0] += 1
+            handler[1] += cpu_time
+
+    @staticmethod
+    def _memory_by_skill(skills: Dict[str, dict]) -> Dict[str, int]:
+        if not tracemalloc.is_tracing():
+            return {}
+        paths = {skill_id: s["path"] for skill_id, s in skills.items() if s["path"]}
+        memory = {skill_id: 0 for skill_id in paths}
+        for stat in tracemalloc.take_snapshot().statistics("filename"):
+            filename = stat.traceback[0].filename
+            for skill_id, path in paths.items():
+                if filename == path or filename.startswith(path + os.sep):
+                    memory[skill_id] += stat.size
+                    break
+        return memory
+
+    @staticmethod
+    def _threads_by_skill(skills: Dict[str, dict]) -> Dict[str, List[str]]:
+        modules = {s["module"]: skill_id for skill_id, s in skills.items() if s["module"]}
+        threads = {}
+        for thread in threading.enumerate():
+            target = getattr(thread, "_target", None)
+            module = getattr(target, "__module__", None) if target else type(thread).__module__
+            skill_id = modules.get((module or "").split(".")[0])
+            if skill_id:
+                threads.setdefault(skill_id, []).append(thread.name)
+        return threads
+
+    def sample(self, baseline: str = "query") -> Dict[str, dict]:
+        """resource usage of every loaded skill
+
+        Args:
+            baseline: cpu_percent is computed since the last sample taken with the same baseline
+        """
+        with self._lock:
+            skills = dict(self._skills)
+        # slow, don't block the handlers accounting meanwhile
+        memory = self._memory_by_skill(skills)
+        threads = self._threads_by_skill(skills)
+        with self._lock:
+            now = time.monotonic()
+            stats = {}
+            last_sample = self._last_sample.setdefault(baseline, {})
+            for skill_id, skill in skills.items():
+                handlers = self._handlers.get(skill_id, {})
+                cpu_time = sum(h[1] for h in handlers.values())
+                last_ts, last_cpu = last_sample.get(skill_id, (now, cpu_time))
+                last_sample[skill_id] = (now, cpu_time)
+                stats[skill_id] = {
+                    "load_time": skill["load_time"],
+                    "threads": threads.get(skill_id, []),
+                    "cpu_time": cpu_time,
+                    "cpu_percent": 100 * (cpu_time - last_cpu) / (now - last_ts) if now > last_ts else 0.0,
+                    "handlers": {msg_type: {"calls": h[0], "cpu_time": h[1]}
+                                 for msg_type, h in handlers.items()}
+                }
+                if skill_id in memory:
+                    stats[skill_id]["memory"] = memory[skill_id]
+        return stats
+
+    def check_limits(self, stats: Dict[str, dict]) -> Dict[str, List[str]]:
+        """skills exceeding the configured soft limits
+
+        Returns:
+            dict: skill_id: list of human readable reasons
+        """
+        limits = self.limits
+        offenders = {}
+        for skill_id, s in stats.items():
+            reasons = []
+            if "memory_mb" in limits and s.get("memory", 0) > limits["memory_mb"] * 1024 * 1024:
+                reasons.append(f"memory {s['memory'] / 1024 / 1024:.1f}MB > {limits['memory_mb']}MB")
+            if "cpu_percent" in limits and s["cpu_percent"] > limits["cpu_percent"]:
+                reasons.append(f"cpu {s['cpu_percent']:.1f}% > {limits['cpu_percent']}%")
+            if "threads" in limits and len(s["threads"]) > limits["threads"]:
+                reasons.append(f"threads {len(s['threads'])} > {limits['threads']}")
+            if reasons:
+                LOG.warning(f"{skill_id} exceeds resource limits: {', '.join(reasons)}")
+                offenders[skill_id] = reasons
+        return offenders
+
+    def shutdown(self):
+        if self.trace_memory and tracemalloc.is_tracing():
+            tracemalloc.stop()
@@ -0,0 +1,208 @@
+"""run selected skills in worker processes, supervised by the SkillManager
+
+CPU heavy skills hold the GIL of the process they run in, isolating them keeps
+intent matching responsive, each worker has its own bus connection
+
+worker protocol, {name} is the worker name from "skills": {"skill_workers": {name: [skill_ids]}}
+    ovos.skills.worker.{name}.ready    worker connected to the bus
+    ovos.skills.worker.{name}.load     {"skill_id"}, answered with .response {"skill_id", "loaded"}
+    ovos.skills.worker.{name}.unload   {"skill_id"}
+"""
+import atexit
+import multiprocessing
+import os
+import signal
+from threading import Event, Lock
+from typing import Dict, Optional, Set
+
+from ovos_bus_client.client import MessageBusClient
+from ovos_bus_client.message import Message
+from ovos_utils.log import LOG
+from ovos_workshop.skill_launcher import PluginSkillLoader
+
+from ovos_plugin_manager.skills import find_skill_plugins
+
+
+class SkillWorker:
+    """loads skills on request, runs inside the worker process"""
+
+    def __init__(self, bus, name: str):
+        self.bus = bus
+        self.name = name
+        self.skills: Dict[str, PluginSkillLoader] = {}
+        self._skill_plugins: Dict[str, type] = {}  # installed skill plugins, from the last scan
+        self.bus.on(f"ovos.skills.worker.{name}.load", self.handle_load)
+        self.bus.on(f"ovos.skills.worker.{name}.unload", self.handle_unload)
+
+    def handle_load(self, message):
+        skill_id = message.data["skill_id"]
+        loaded = skill_id in self.skills or self.load_skill(skill_id)
+        self.bus.emit(message.response({"skill_id": skill_id, "loaded": loaded}))
+
+    def handle_unload(self, message):
+        self.unload_skill(message.data["skill_id"])
+
+    def _find_skill_class(self, skill_id: str) -> Optional[type]:
+        if skill_id not in self._skill_plugins:  # first load or installed after the last scan
+            self._skill_plugins = find_skill_plugins()
+        return self._skill_plugins.get(skill_id)
+
+    def load_skill(self, skill_id: str) -> bool:
+        skill_class = self._find_skill_class(skill_id)
+        if skill_class is None:
+            LOG.error(f"{skill_id} is not installed, can not load it in worker '{self.name}'")
+            return False
+        loader = PluginSkillLoader(self.bus, skill_id)
+        loader.skill_class = skill_class
+        try:
+            if not loader.load(skill_class):
+                return False
+        except Exception:
+            LOG.exception(f'Load of skill {skill_id} failed!')
+            return False
+        self.skills[skill_id] = loader
+        return True
+
+    def unload_skill(self, skill_id: str):
+        skill_loader = self.skills.pop(skill_id, None)
+        if skill_loader is None or skill_loader.instance is None:
+            return
+        try:
+            skill_loader.instance.shutdown()
+        except Exception:
+            LOG.exception('Failed to run skill specific shutdown code: ' + skill_id)
+        try:
+            skill_loader.instance.default_shutdown()
+        except Exception:
+            LOG.exception('Failed to shutdown skill: ' + skill_id)
+
+    def shutdown(self):
+        for skill_id in list(self.skills):
+            self.unload_skill(skill_id)
+        self.bus.remove(f"ovos.skills.worker.{self.name}.load", self.handle_load)
+        self.bus.remove(f"ovos.skills.worker.{self.name}.unload", self.handle_unload)
+
+
+def run_skill_worker(name: str, parent_pid: int):
+    """entrypoint of the worker process, runs until terminated or the SkillManager dies"""
+    from ovos_config.locale import setup_locale
+    from ovos_utils.log import init_service_logger
+
+    init_service_logger("skills")
+    setup_locale()
+    exit_event = Event()
+    signal.signal(signal.SIGTERM, lambda *args: exit_event.set())
+    signal.signal(signal.SIGINT, lambda *args: exit_event.set())
+
+    bus = MessageBusClient(cache=True)
+    bus.run_in_thread()
+    bus.connected_event.wait()
+    worker = SkillWorker(bus, name)
+    bus.emit(Message(f"ovos.skills.worker.{name}.ready"))
+    LOG.info(f"skill worker '{name}' ready")
+    while not exit_event.wait(5):
+        if os.getppid() != parent_pid:  # orphaned
+            break
+    worker.shutdown()
+    bus.close()
+
+
+class SkillWorkerProcess:
+    """handle to a worker process, used by the SkillManager to load skills and restart it"""
+
+    def __init__(self, bus, name: str, ready_timeout: float = 60, load_timeout: float = 60):
+        self.bus = bus
+        self.name = name
+        self.ready_timeout = ready_timeout
+        self.load_timeout = load_timeout
+        self.skill_ids: Set[str] = set()  # skills that should be running in this worker
+        self.process = None
+        self.restarts = 0
+        self._ready = Event()
+        self._lock = Lock()
+        self.bus.on(f"ovos.skills.worker.{name}.ready", self.handle_ready)
+
+    def handle_ready(self, message):
+        self._ready.set()
+
+    def is_alive(self) -> bool:
+        return self.process is not None and self.process.is_alive()
+
+    def start(self):
+        self._ready.clear()
+        # spawn, forking a process with a running bus client and threads is not safe
+        ctx = multiprocessing.get_context("spawn")
+        # not a daemon, daemonic processes can't have children and skills may use multiprocessing,
+        # stopped by SkillManager.shutdown or at exit, before multiprocessing joins its children
+        self.process = ctx.Process(target=run_skill_worker, args=(self.name, os.getpid()),
+                                   name=f"SkillWorker-{self.name}")
+        self.process.start()
+        atexit.register(self._terminate)
+        LOG.info(f"Started skill worker '{self.name}' (pid {self.process.pid})")
+
+    def load(self, skill_id: str) -> bool:
+        """load a skill in the worker, starting it if needed"""
+        with self._lock:
+            if not self.is_alive():
+                self.start()
+            if not self._ready.wait(self.ready_timeout):
+                LOG.error(f"skill worker '{self.name}' did not start in {self.ready_timeout} seconds")
+                return False
+            response = self.bus.wait_for_response(
+                Message(f"ovos.skills.worker.{self.name}.load", {"skill_id": skill_id}),
+                timeout=self.load_timeout)
+            loaded = bool(response and response.data.get("loaded"))
+            if loaded:
+                self.skill_ids.add(skill_id)
+            return loaded
+
+    def unload(self, skill_id: str):
+        self.skill_ids.discard(skill_id)
+        if self.is_alive():
+            self.bus.emit(Message(f"ovos.skills.worker.{self.name}.unload", {"skill_id": skill_id}))
+
+    def restart(self) -> Set[str]:
+        """start a dead worker again and reload its skills
+
+        Returns:
+            set: skill_ids that failed to load
+        """
+        self.restarts += 1
+        skill_ids = set(self.skill_ids)
+        self.skill_ids.clear()
+        return {skill_id for skill_id in skill_ids if not self.load(skill_id)}
+
+    def stop(self, timeout: float = 10):
+        self.bus.remove(f"ovos.skills.worker.{self.name}.ready", self.handle_ready)
+        self._terminate(timeout)
+
+    def _terminate(self, timeout: float = 10):
+        atexit.unregister(self._terminate)
+        if not self.is_alive():
+            return
+        self.process.terminate()
+        self.process.join(timeout)
+        if self.process.is_alive():
+            LOG.warning(f"skill worker '{self.name}' did not exit, killing it")
+            self.process.kill()
+
+
+class IsolatedSkillLoader:
+    """stands in for a PluginSkillLoader in SkillManager.plugin_skills, the skill runs in a worker"""
+
+    def __init__(self, worker: SkillWorkerProcess, skill_id: str):
+        self.worker = worker
+        self.skill_id = skill_id
+        self.instance = None
+        self.active = True
+
+    @property
+    def loaded(self) -> bool:
+        return self.skill_id in self.worker.skill_ids
+
+    def activate(self):
+        self.active = self.worker.load(self.skill_id)
+
+    def deactivate(self):
+        self.active = False
+        self.worker.unload(self.skill_id)
@@ -0,0 +1,182 @@
+"""boot timeline of ovos-core, enabled with `ovos-core --profile-startup`
+
+records nested spans (imports, plugin discovery, plugin and skill loading, training)
+and saves them as a json report and a Chrome trace-event file (chrome://tracing, https://ui.perfetto.dev)
+
+only depends on the standard library, it is started at the top of ovos_core/__main__.py before the
+skill manager is imported, the interpreter startup and the ovos_core package import are not part of the timeline
+
+the profiler stops itself after `max_duration` seconds, so a boot that never becomes ready
+does not keep the import hook installed and collect spans forever
+"""
+import importlib.abc
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+# seconds, the profiler is stopped if ovos-core did not become ready by then
+MAX_PROFILE_DURATION = 600
+
+
+class _TimedLoader(importlib.abc.Loader):
+    """wraps a module loader, timing the execution of the module"""
+
+    def __init__(self, loader, profiler: "StartupProfiler"):
+        self._loader = loader
+        self._profiler = profiler
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        # restore the real loader, other code may inspect module.__loader__
+        module.__loader__ = self._loader
+        if module.__spec__ is not None:
+            module.__spec__.loader = self._loader
+        with self._profiler.span(module.__name__, "import"):
+            self._loader.exec_module(module)
+
+
+class _ImportTimer(importlib.abc.MetaPathFinder):
+    """meta path hook wrapping the loader found by the other finders"""
+
+    def __init__(self, profiler: "StartupProfiler"):
+        self._profiler = profiler
+
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is None:
+                continue
+            if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                spec.loader = _TimedLoader(spec.loader, self._profiler)
+            return spec
+        return None
+
+
+class StartupProfiler:
+    """collects the boot timeline, a no-op until started"""
+
+    def __init__(self):
+        self.enabled = False
+        self.events: List[dict] = []
+        self._t0 = time.perf_counter()
+        self._end: Optional[float] = None
+        self._lock = threading.Lock()
+        self._import_timer: Optional[_ImportTimer] = None
+        self._deadline: Optional[threading.Timer] = None
+
+    def start(self, trace_imports: bool = True, max_duration: Optional[float] = None):
+        self.events = []
+        self._t0 = time.perf_counter()
+        self._end = None
+        self.enabled = True
+        if trace_imports and self._import_timer is None:
+            self._import_timer = _ImportTimer(self)
+            sys.meta_path.insert(0, self._import_timer)
+        if max_duration:
+            self._deadline = threading.Timer(max_duration, self.stop)
+            self._deadline.daemon = True
+            self._deadline.start()
+
+    def stop(self):
+        """stop collecting spans, calling it again keeps the original end time"""
+        if self.enabled:
+            self._end = time.perf_counter()
+        self.enabled = False
+        if self._import_timer is not None:
+            sys.meta_path.remove(self._import_timer)
+            self._import_timer = None
+        if self._deadline is not None:
+            self._deadline.cancel()
+            self._deadline = None
+
+    @contextmanager
+    def span(self, name: str, category: str = "boot", **args):
+        """time the wrapped block"""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, category, start, time.perf_counter(), **args)
+
+    def add(self, name: str, category: str, start: float, end: float, **args):
+        """record a span measured with time.perf_counter"""
+        if not self.enabled:
+            return
+        thread = threading.current_thread()
+        with self._lock:
+            self.events.append({"name": name, "category": category,
+                                "start": start - self._t0, "duration": end - start,
+                                "thread": thread.name, "tid": thread.ident, "args": args})
+
+    def report(self, top: int = 20) -> dict:
+        """boot summary, spans are in seconds since the profiler started"""
+        events = sorted(self.events, key=lambda e: e["start"])
+        end = (self._end or time.perf_counter()) - self._t0
+        categories: Dict[str, float] = {}
+        for e in events:
+            categories[e["category"]] = categories.get(e["category"], 0) + e["duration"]
+        imports = [e for e in events if e["category"] == "import"]
+        return {"total": end,
+                "categories": categories,  # nested spans of the same category are counted twice
+                "slowest": [{k: e[k] for k in ("name", "category", "duration")}
+                            for e in sorted((e for e in events if e["category"] != "import"),
+                                            key=lambda e: e["duration"], reverse=True)[:top]],
+                "slowest_imports": [{"name": e["name"], "duration": e["duration"]}
+                                    for e in sorted(imports, key=lambda e: e["duration"], reverse=True)[:top]],
+                "spans": [{k: v for k, v in e.items() if k != "tid"} for e in events]}
+
+    def trace_events(self) -> dict:
+        """the timeline in the Chrome trace-event format"""
+        pid = os.getpid()
+        trace = [{"name": e["name"], "cat": e["category"], "ph": "X", "pid": pid, "tid": e["tid"],
+                  "ts": e["start"] * 1e6, "dur": e["duration"] * 1e6, "args": e["args"]}
+                 for e in self.events]
+        threads = {e["tid"]: e["thread"] for e in self.events}
+        trace += [{"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}}
+                  for tid, name in threads.items()]
+        return {"traceEvents": trace, "displayTimeUnit": "ms"}
+
+    def save(self, directory: str) -> List[str]:
+        """write startup_profile.json and startup_trace.json
+
+        Returns:
+            list: paths of the written files
+        """
+        os.makedirs(directory, exist_ok=True)
+        paths = [os.path.join(directory, "startup_profile.json"),
+                 os.path.join(directory, "startup_trace.json")]
+        for path, data in zip(paths, (self.report(), self.trace_events())):
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2, default=str)
+        return paths
+
+
+def profile_dir_from_argv(argv: List[str]) -> Optional[str]:
+    """value of --profile-startup in the command line arguments
+
+    Returns:
+        str: the directory, "" if the flag was given without one, None if it was not given
+    """
+    for idx, arg in enumerate(argv):
+        if arg.startswith("--profile-startup="):
+            return arg.split("=", 1)[1]
+        if arg == "--profile-startup":
+            if idx + 1 < len(argv) and not argv[idx + 1].startswith("-"):
+                return argv[idx + 1]
+            return ""
+    return None
+
+
+# shared by all ovos-core components of this process
+profiler = StartupProfiler()
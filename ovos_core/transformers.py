@@ -1,4 +1,10 @@
-from typing import Optional, List
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from copy import deepcopy
+from threading import Lock
+from typing import Optional, List, Dict, Tuple, Callable
+
+from ovos_bus_client.message import Message
 from ovos_config import Configuration
 from ovos_plugin_manager.intent_transformers import find_intent_transformer_plugins
 from ovos_plugin_manager.metadata_transformers import find_metadata_transformer_plugins
@@ -8,8 +14,238 @@ from ovos_plugin_manager.templates.pipeline import IntentHandlerMatch
 from ovos_utils.json_helper import merge_dict
 from ovos_utils.log import LOG
 
+from ovos_core.startup_profiler import profiler
+
+
+class TransformerChain:
+    """Priority ordered snapshot of the loaded transformer plugins
+
+    The chain is immutable, services rebuild it when plugins are loaded or unloaded,
+    or when `invalidate_chain()` is called after changing a plugin priority
+
+    Per plugin call counters and timings are kept across rebuilds, they are updated
+    under a lock since utterances of different sessions are transformed concurrently
+    """
+
+    def __init__(self, loaded_plugins: Dict[str, object], previous: Optional["TransformerChain"] = None):
+        self.entries: Tuple[Tuple[str, object], ...] = tuple(
+            sorted(loaded_plugins.items(), key=lambda k: k[1].priority, reverse=True))
+        # chains in use by a transform that started before the rebuild share the same counters
+        self._lock = previous._lock if previous else Lock()
+        stats = previous.stats if previous else {}
+        self.stats = {name: stats.get(name) or {"calls": 0, "errors": 0, "timeouts": 0, "skipped": 0,
+                                                "total_time": 0.0, "max_time": 0.0}
+                      for name, _ in self.entries}
+
+    @property
+    def plugins(self) -> list:
+        return [plug for _, plug in self.entries]
+
+    def record(self, name: str, elapsed: float, error: bool = False, timeout: bool = False):
+        """track a plugin call"""
+        with self._lock:
+            stats = self.stats[name]
+            stats["calls"] += 1
+            stats["total_time"] += elapsed
+            stats["max_time"] = max(stats["max_time"], elapsed)
+            if error:
+                stats["errors"] += 1
+            if timeout:
+                stats["timeouts"] += 1
+
+    def skip(self, name: str):
+        """track a plugin call skipped by its circuit breaker"""
+        with self._lock:
+            self.stats[name]["skipped"] += 1
+
+
+class _PluginRegistry(dict):
+    """loaded plugins by name, calls on_change whenever plugins are added or removed"""
+
+    def __init__(self, on_change: Callable[[], None], *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._on_change = on_change
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._on_change()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._on_change()
+
+    def pop(self, *args):
+        value = super().pop(*args)
+        self._on_change()
+        return value
+
+    def popitem(self):
+        item = super().popitem()
+        self._on_change()
+        return item
+
+    def setdefault(self, key, default=None):
+        value = super().setdefault(key, default)
+        self._on_change()
+        return value
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self._on_change()
+
+    def clear(self):
+        super().clear()
+        self._on_change()
+
+
+class _ChainedPluginsMixin:
+    """`loaded_plugins` registry and the cached TransformerChain built from it"""
+    _chain: Optional[TransformerChain] = None
+    _chain_stale = True
+
+    @property
+    def loaded_plugins(self) -> Dict[str, object]:
+        return self._loaded_plugins
+
+    @loaded_plugins.setter
+    def loaded_plugins(self, plugins: Dict[str, object]):
+        self._loaded_plugins = _PluginRegistry(self.invalidate_chain, plugins)
+        self.invalidate_chain()
+
+    def invalidate_chain(self):
+        """rebuild the chain on next use, call it after changing the priority of a loaded plugin"""
+        self._chain_stale = True
+
+    @property
+    def chain(self) -> TransformerChain:
+        """priority ordered plugins, rebuilt only after plugins were loaded, unloaded or reprioritized"""
+        if self._chain_stale or self._chain is None:
+            self._chain_stale = False
+            self._chain = TransformerChain(self.loaded_plugins, self._chain)
+        return self._chain
+
 
-class UtteranceTransformersService:
+class TransformerTimeoutError(TimeoutError):
+    """a transformer plugin did not return before its deadline"""
+
+
+class TransformerGuard:
+    """Per plugin deadlines and circuit breakers for transformer plugins
+
+    Configured per plugin, eg. under `utterance_transformers`
+
+        "ovos-bidirectional-translation-plugin": {
+            "timeout": 1.0,      # seconds, no deadline if not set
+            "max_timeouts": 3,   # consecutive overruns before the plugin is skipped
+            "cooldown": 60       # seconds to skip the plugin before probing it again
+        }
+
+    After the cooldown the next call is a half-open probe, its result is
+    reported on the bus via 'ovos.transformers.breaker.probe'
+
+    Calls with a deadline run on a bounded thread pool, sized by `timeout_workers`
+    in the service config. A plugin that overruns keeps its worker until it returns,
+    callers must not hand it objects that are still in use afterwards
+    """
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, bus, service: str, config: Dict[str, dict]):
+        self.bus = bus
+        self.service = service
+        self.config = config
+        self._state: Dict[str, str] = {}
+        self._overruns: Dict[str, int] = {}
+        self._opened_at: Dict[str, float] = {}
+        self._lock = Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def _plugin_config(self, name: str) -> dict:
+        return self.config.get(name) or {}
+
+    def state(self, name: str) -> str:
+        return self._state.get(name, self.CLOSED)
+
+    def allow(self, name: str) -> bool:
+        """False if the plugin circuit is open and should be skipped"""
+        with self._lock:
+            state = self.state(name)
+            if state == self.OPEN:
+                cooldown = self._plugin_config(name).get("cooldown", 60)
+                if time.monotonic() - self._opened_at[name] < cooldown:
+                    return False
+                self._state[name] = self.HALF_OPEN  # let a single probe through
+                return True
+            return state == self.CLOSED
+
+    def call(self, name: str, func: Callable, *args):
+        """call a plugin method, enforcing the plugin deadline if configured
+
+        Raises:
+            TransformerTimeoutError: plugin did not return in time, result is discarded
+        """
+        timeout = self._plugin_config(name).get("timeout")
+        if not timeout:
+            result = func(*args)
+        else:
+            future = self._get_executor().submit(func, *args)
+            try:
+                result = future.result(timeout)
+            except FutureTimeoutError:
+                future.cancel()  # only drops it if still queued behind other overruns
+                self._on_timeout(name, timeout)
+                raise TransformerTimeoutError(f"{name} exceeded {timeout} seconds")
+            except Exception:
+                self._on_success(name)  # plugin answered in time, errors are not overruns
+                raise
+        self._on_success(name)
+        return result
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.config.get("timeout_workers", 4),
+                                                    thread_name_prefix=self.service)
+            return self._executor
+
+    def shutdown(self):
+        if self._executor:
+            self._executor.shutdown(wait=False)
+
+    def _on_success(self, name: str):
+        with self._lock:
+            self._overruns[name] = 0
+            probing = self.state(name) == self.HALF_OPEN
+            self._state[name] = self.CLOSED
+        if probing:
+            LOG.info(f"{name} answered the probe in time, closing circuit breaker")
+            self._emit("ovos.transformers.breaker.probe", name, {"success": True})
+
+    def _on_timeout(self, name: str, timeout: float):
+        cfg = self._plugin_config(name)
+        with self._lock:
+            self._overruns[name] = self._overruns.get(name, 0) + 1
+            probing = self.state(name) == self.HALF_OPEN
+            tripped = probing or self._overruns[name] >= cfg.get("max_timeouts", 3)
+            if tripped:
+                self._state[name] = self.OPEN
+                self._opened_at[name] = time.monotonic()
+        if probing:
+            LOG.warning(f"{name} failed the probe, skipping it for another {cfg.get('cooldown', 60)} seconds")
+            self._emit("ovos.transformers.breaker.probe", name, {"success": False})
+        elif tripped:
+            LOG.error(f"{name} exceeded its {timeout}s deadline {self._overruns[name]} times in a row, "
+                      f"skipping it for {cfg.get('cooldown', 60)} seconds")
+            self._emit("ovos.transformers.breaker.open", name, {"timeouts": self._overruns[name]})
+
+    def _emit(self, msg_type: str, name: str, data: dict):
+        if self.bus is None:
+            return
+        self.bus.emit(Message(msg_type, {"plugin": name, "service": self.service, **data}))
+
+
+class UtteranceTransformersService(_ChainedPluginsMixin):
 
     def __init__(self, bus, config=None):
         self.config_core = config or Configuration()
@@ -17,11 +253,13 @@ class UtteranceTransformersService:
         self.has_loaded = False
         self.bus = bus
         self.config = self.config_core.get("utterance_transformers") or {}
+        self.guard = TransformerGuard(bus, "utterance_transformers", self.config)
         self.load_plugins()
 
     @staticmethod
     def find_plugins():
-        return find_utterance_transformer_plugins().items()
+        with profiler.span("find_utterance_transformer_plugins", "discovery"):
+            return find_utterance_transformer_plugins().items()
 
     def load_plugins(self):
         for plug_name, plug in self.find_plugins():
@@ -30,7 +268,8 @@ class UtteranceTransformersService:
                 if not self.config[plug_name].get("active", True):
                     continue
                 try:
-                    self.loaded_plugins[plug_name] = plug()
+                    with profiler.span(plug_name, "transformers"):
+                        self.loaded_plugins[plug_name] = plug()
                     LOG.info(f"loaded utterance transformer plugin: {plug_name}")
                 except Exception as e:
                     LOG.error(e)
@@ -46,8 +285,7 @@ class UtteranceTransformersService:
         A plugin of `priority` 1 will override any existing context keys and
         will be the last to modify utterances`
         """
-        return sorted(self.loaded_plugins.values(),
-                      key=lambda k: k.priority, reverse=True)
+        return self.chain.plugins
 
     def shutdown(self):
         for module in self.plugins:
@@ -55,22 +293,94 @@ class UtteranceTransformersService:
                 module.shutdown()
             except:
                 pass
+        self.guard.shutdown()
 
     def transform(self, utterances: List[str], context: Optional[dict] = None):
         context = context or {}
 
-        for module in self.plugins:
-            try:
-                utterances, data = module.transform(utterances, context)
-                _safe = {k:v for k,v in data.items() if k != "session"}  # no leaking TTS/STT creds in logs    
-                LOG.debug(f"{module.name}: {_safe}")
-                context = merge_dict(context, data)
-            except Exception as e:
-                LOG.warning(f"{module.name} transform exception: {e}")
+        chain = self.chain
+        for name, module in chain.entries:
+            utterances, context = self._call_plugin(chain, name, module, utterances, context)
         return utterances, context
 
+    def _call_plugin(self, chain: TransformerChain, name: str, module,
+                     utterances: List[str], context: dict) -> Tuple[List[str], dict]:
+        """run a single plugin, utterances and context are returned unchanged if it was skipped or failed"""
+        if not self.guard.allow(name):
+            chain.skip(name)
+            return utterances, context
+        start = time.monotonic()
+        try:
+            # the plugin works on copies, a call abandoned at its deadline can't modify the live context
+            new_utterances, data = self.guard.call(name, module.transform, list(utterances), deepcopy(context))
+            chain.record(name, time.monotonic() - start)
+            _safe = {k:v for k,v in data.items() if k != "session"}  # no leaking TTS/STT creds in logs
+            LOG.debug(f"{module.name}: {_safe}")
+            utterances, context = new_utterances, merge_dict(context, data)
+        except TransformerTimeoutError as e:
+            chain.record(name, time.monotonic() - start, error=True, timeout=True)
+            LOG.warning(f"{module.name} transform timed out: {e}")
+        except Exception as e:
+            chain.record(name, time.monotonic() - start, error=True)
+            LOG.warning(f"{module.name} transform exception: {e}")
+        return utterances, context
+
+    def transform_batch(self, batch: List[List[str]],
+                        context: Optional[dict] = None) -> List[Tuple[List[str], dict]]:
+        """
+        Transform many utterance lists sharing the same base context, eg. for offline evaluation
+
+        Plugins implementing `transform_batch(batch, contexts)` are called once for the
+        whole batch and must return a list of (utterances, context) tuples,
+        other plugins are called once per item. If a plugin returns a different number
+        of results than items, the items are transformed one by one instead
 
-class MetadataTransformersService:
+        Args:
+            batch: list of utterance lists
+            context: base context, copied for every item
+
+        Returns:
+            list of (utterances, context), one per item in the batch
+        """
+        context = context or {}
+        items = [(utterances, dict(context)) for utterances in batch]
+
+        chain = self.chain
+        for name, module in chain.entries:
+            if not callable(getattr(module, "transform_batch", None)):
+                items = [self._call_plugin(chain, name, module, utterances, ctx)
+                         for utterances, ctx in items]
+                continue
+            if not self.guard.allow(name):
+                chain.skip(name)
+                continue
+            start = time.monotonic()
+            try:
+                results = list(self.guard.call(name, module.transform_batch,
+                                               [list(utterances) for utterances, _ in items],
+                                               [deepcopy(ctx) for _, ctx in items]))
+                chain.record(name, time.monotonic() - start)
+            except TransformerTimeoutError as e:
+                chain.record(name, time.monotonic() - start, error=True, timeout=True)
+                LOG.warning(f"{module.name} transform_batch timed out: {e}")
+                continue
+            except Exception as e:
+                chain.record(name, time.monotonic() - start, error=True)
+                LOG.warning(f"{module.name} transform_batch exception: {e}")
+                continue
+            if len(results) != len(items):
+                # zip would silently drop utterances
+                LOG.error(f"{module.name} transform_batch returned {len(results)} results "
+                          f"for {len(items)} items, transforming them one by one")
+                items = [self._call_plugin(chain, name, module, utterances, ctx)
+                         for utterances, ctx in items]
+                continue
+            items = [(utterances, merge_dict(ctx, data))
+                     for (utterances, data), (_, ctx) in zip(results, items)]
+        return items
+
+
+class MetadataTransformersService(_ChainedPluginsMixin):
 
     def __init__(self, bus, config=None):
         self.config_core = config or Configuration()
@@ -78,11 +388,15 @@ class MetadataTransformersService:
         self.has_loaded = False
         self.bus = bus
         self.config = self.config_core.get("metadata_transformers") or {}
+        self.guard = TransformerGuard(bus, "metadata_transformers", self.config)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._waves: Optional[Tuple[TransformerChain, list]] = None
         self.load_plugins()
 
     @staticmethod
     def find_plugins():
-        return find_metadata_transformer_plugins().items()
+        with profiler.span("find_metadata_transformer_plugins", "discovery"):
+            return find_metadata_transformer_plugins().items()
 
     def load_plugins(self):
         for plug_name, plug in self.find_plugins():
@@ -91,7 +405,8 @@ class MetadataTransformersService:
                 if not self.config[plug_name].get("active", True):
                     continue
                 try:
-                    self.loaded_plugins[plug_name] = plug()
+                    with profiler.span(plug_name, "transformers"):
+                        self.loaded_plugins[plug_name] = plug()
                     LOG.info(f"loaded metadata transformer plugin: {plug_name}")
                 except Exception as e:
                     LOG.error(e)
@@ -106,8 +421,7 @@ class MetadataTransformersService:
 
         A plugin of `priority` 1 will override any existing context keys
         """
-        return sorted(self.loaded_plugins.values(),
-                      key=lambda k: k.priority, reverse=True)
+        return self.chain.plugins
 
     def shutdown(self):
         for module in self.plugins:
@@ -115,13 +429,18 @@ class MetadataTransformersService:
                 module.shutdown()
             except:
                 pass
+        self.guard.shutdown()
+        if self._executor:
+            self._executor.shutdown(wait=False)
 
     def transform(self, context: Optional[dict] = None):
         """
-        Sequentially applies all loaded metadata transformer plugins to the provided context.
+        Applies all loaded metadata transformer plugins to the provided context.
 
         Each plugin's `transform` method is called in order of descending priority, and the resulting data is merged into the context. Sensitive session data is excluded from debug logs. Exceptions raised by plugins are logged as warnings and do not interrupt the transformation process.
 
+        If `parallel` is enabled in the `metadata_transformers` config, plugins that do not depend on each other run concurrently, see `_transform_parallel`
+
         Args:
             context: Optional dictionary containing metadata to be transformed.
 
@@ -130,18 +449,105 @@ class MetadataTransformersService:
         """
         context = context or {}
 
-        for module in self.plugins:
-            try:
-                data = module.transform(context)                
-                _safe = {k:v for k,v in data.items() if k != "session"}  # no leaking TTS/STT creds in logs    
-                LOG.debug(f"{module.name}: {_safe}")
+        chain = self.chain
+        if self.config.get("parallel"):
+            return self._transform_parallel(chain, context)
+
+        for name, module in chain.entries:
+            data = self._call_plugin(chain, name, module, context)
+            if data is not None:
                 context = merge_dict(context, data)
-            except Exception as e:
-                LOG.warning(f"{module.name} transform exception: {e}")
+        return context
+
+    def _call_plugin(self, chain: TransformerChain, name: str, module, context: dict) -> Optional[dict]:
+        """run a single plugin, returns None if it was skipped or failed"""
+        if not self.guard.allow(name):
+            chain.skip(name)
+            return None
+        start = time.monotonic()
+        try:
+            data = self.guard.call(name, module.transform, deepcopy(context))
+            chain.record(name, time.monotonic() - start)
+            _safe = {k:v for k,v in data.items() if k != "session"}  # no leaking TTS/STT creds in logs
+            LOG.debug(f"{module.name}: {_safe}")
+            return data
+        except TransformerTimeoutError as e:
+            chain.record(name, time.monotonic() - start, error=True, timeout=True)
+            LOG.warning(f"{module.name} transform timed out: {e}")
+        except Exception as e:
+            chain.record(name, time.monotonic() - start, error=True)
+            LOG.warning(f"{module.name} transform exception: {e}")
+        return None
+
+    def _declared_keys(self, name: str, module) -> Optional[Tuple[set, set]]:
+        """context keys a plugin reads and writes
+
+        declared in the plugin config as `reads`/`writes` or by the plugin
+        itself via `context_reads`/`context_writes` attributes
+
+        Returns:
+            (reads, writes) or None if the plugin did not declare them
+        """
+        cfg = self.config.get(name) or {}
+        reads = cfg.get("reads", getattr(module, "context_reads", None))
+        writes = cfg.get("writes", getattr(module, "context_writes", None))
+        if not isinstance(reads, (list, tuple, set)) or not isinstance(writes, (list, tuple, set)):
+            return None
+        return set(reads), set(writes)
+
+    def _get_waves(self, chain: TransformerChain) -> List[List[Tuple[str, object]]]:
+        """group plugins into waves that can run concurrently
+
+        a plugin runs in a later wave than any higher priority plugin whose output it reads,
+        and never in an earlier wave than a higher priority plugin it conflicts with,
+        undeclared plugins run alone and act as a barrier
+        """
+        if self._waves is not None and self._waves[0] is chain:
+            return self._waves[1]
+        waves = []
+        scheduled = []  # (wave index, reads, writes)
+        barrier = -1
+        for name, module in chain.entries:
+            keys = self._declared_keys(name, module)
+            if keys is None:
+                barrier = len(waves)
+                waves.append([(name, module)])
+                continue
+            reads, writes = keys
+            idx = barrier + 1
+            for wave_idx, other_reads, other_writes in scheduled:
+                if wave_idx < barrier:
+                    continue
+                if reads & other_writes:
+                    idx = max(idx, wave_idx + 1)  # needs the output of that plugin
+                elif writes & (other_writes | other_reads):
+                    idx = max(idx, wave_idx)  # must be merged after / not seen by that plugin
+            if idx == len(waves):
+                waves.append([])
+            waves[idx].append((name, module))
+            scheduled.append((idx, reads, writes))
+        self._waves = (chain, waves)
+        return waves
+
+    def _transform_parallel(self, chain: TransformerChain, context: dict) -> dict:
+        """run non conflicting plugins concurrently, writes are applied in priority order"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.config.get("parallel_workers", 4),
+                                                thread_name_prefix="metadata_transformers")
+        for wave in self._get_waves(chain):
+            if len(wave) == 1:
+                results = [self._call_plugin(chain, wave[0][0], wave[0][1], context)]
+            else:
+                futures = [self._executor.submit(self._call_plugin, chain, name, module, context)
+                           for name, module in wave]
+                results = [f.result() for f in futures]
+            for data in results:
+                if data is not None:
+                    context = merge_dict(context, data)
         return context
 
 
-class IntentTransformersService:
+class IntentTransformersService(_ChainedPluginsMixin):
 
     def __init__(self, bus, config=None):
         """
@@ -154,6 +560,7 @@ class IntentTransformersService:
         self.has_loaded = False
         self.bus = bus
         self.config = self.config_core.get("intent_transformers") or {}
+        self.guard = TransformerGuard(bus, "intent_transformers", self.config)
         self.load_plugins()
 
     @staticmethod
@@ -164,7 +571,8 @@ class IntentTransformersService:
         Returns:
             An iterable of (plugin_name, plugin_class) pairs for all discovered intent transformer plugins.
         """
-        return find_intent_transformer_plugins().items()
+        with profiler.span("find_intent_transformer_plugins", "discovery"):
+            return find_intent_transformer_plugins().items()
 
     def load_plugins(self):
         """
@@ -178,7 +586,8 @@ class IntentTransformersService:
                 if not self.config[plug_name].get("active", True):
                     continue
                 try:
-                    self.loaded_plugins[plug_name] = plug()
+                    with profiler.span(plug_name, "transformers"):
+                        self.loaded_plugins[plug_name] = plug()
                     self.loaded_plugins[plug_name].bind(self.bus)
                     LOG.info(f"loaded intent transformer plugin: {plug_name}")
                 except Exception as e:
@@ -190,8 +599,7 @@ class IntentTransformersService:
         """
         Returns the loaded intent transformer plugins sorted by priority.
         """
-        return sorted(self.loaded_plugins.values(),
-                      key=lambda k: k.priority, reverse=True)
+        return self.chain.plugins
 
     def shutdown(self):
         """
@@ -202,6 +610,7 @@ class IntentTransformersService:
                 module.shutdown()
             except:
                 pass
+        self.guard.shutdown()
 
     def transform(self, intent: IntentHandlerMatch) -> IntentHandlerMatch:
         """
@@ -215,10 +624,20 @@ class IntentTransformersService:
         Returns:
             The transformed intent match object after all plugins have been applied.
         """
-        for module in self.plugins:
+        chain = self.chain
+        for name, module in chain.entries:
+            if not self.guard.allow(name):
+                chain.skip(name)
+                continue
+            start = time.monotonic()
             try:
-                intent = module.transform(intent)
+                intent = self.guard.call(name, module.transform, intent)
+                chain.record(name, time.monotonic() - start)
                 LOG.debug(f"{module.name}: {intent}")
+            except TransformerTimeoutError as e:
+                chain.record(name, time.monotonic() - start, error=True, timeout=True)
+                LOG.warning(f"{module.name} transform timed out: {e}")
             except Exception as e:
+                chain.record(name, time.monotonic() - start, error=True)
                 LOG.warning(f"{module.name} transform exception: {e}")
         return intent
@@ -44,7 +44,7 @@ class TestFallback(TestCase):
             expected_messages=[
                 message,
                 Message("ovos.skills.fallback.ping",
-                        {"utterances": ["hello world"], "lang": session.lang, "range": [90, 101]}),
+                        {"utterances": ["hello world"], "lang": session.lang, "range": [0, 101]}),
                 Message("ovos.skills.fallback.pong", {"skill_id": self.skill_id, "can_handle": True}),
                 Message(f"ovos.skills.fallback.{self.skill_id}.request",
                         {"utterances": ["hello world"], "lang": session.lang, "range": [90, 101], "skill_id": self.skill_id}),
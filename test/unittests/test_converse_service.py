@@ -0,0 +1,184 @@
+import time
+from threading import Thread
+from unittest import TestCase
+
+from ovos_bus_client.message import Message
+from ovos_bus_client.session import Session
+from ovos_utils.fakebus import FakeBus
+
+from ovos_core.intent_services.converse_service import ConverseService
+from ovos_core.intent_services.ping_pong import LatencyTracker, PingPongMultiplexer
+
+
+class TestLatencyTracker(TestCase):
+    def test_deadline(self):
+        tracker = LatencyTracker(max_timeout=0.5, min_timeout=0.1, factor=2.0)
+        self.assertEqual(tracker.deadline("unknown.skill"), 0.5)
+        for _ in range(10):
+            tracker.record("fast.skill", 0.01)
+        self.assertEqual(tracker.deadline("fast.skill"), 0.1)
+        for _ in range(10):
+            tracker.record("slow.skill", 0.2)
+        self.assertEqual(tracker.deadline("slow.skill"), 0.4)
+        tracker.record_timeout("slow.skill")
+        self.assertEqual(tracker.stats()["slow.skill"]["timeouts"], 1)
+
+
+class TestPingPongMultiplexer(TestCase):
+    def test_routing(self):
+        bus = FakeBus()
+        pings = PingPongMultiplexer(bus)
+        ping_a = pings.open("test.pong", "session-a", ["test.skill"])
+        ping_b = pings.open("test.pong", "session-b", ["test.skill"])
+        message = Message("test")
+        # answers are routed by correlation id
+        bus.emit(Message("test.ping", context=ping_a.context(message)).reply(
+            "test.pong", {"skill_id": "test.skill", "can_handle": False}))
+        self.assertEqual(ping_a.answers, {"test.skill": False})
+        self.assertEqual(ping_b.answers, {})
+        # or by session if the skill didn't keep the context
+        bus.emit(Message("test.pong", {"skill_id": "test.skill"},
+                         {"session": {"session_id": "session-b"}}))
+        self.assertEqual(ping_b.answers, {"test.skill": True})
+        # unexpected skills are ignored
+        bus.emit(Message("test.pong", {"skill_id": "other.skill"}, ping_b.context(message)))
+        self.assertEqual(ping_b.answers, {"test.skill": True})
+        self.assertIn("test.skill", ping_b.latencies)
+
+        pings.close(ping_a)
+        pings.close(ping_b)
+        pings.shutdown()
+        self.assertFalse(bus.ee.listeners("test.pong"))
+
+
+class TestConversePing(TestCase):
+    def setUp(self):
+        self.bus = FakeBus()
+        self.converse = ConverseService(self.bus, config={"ping_timeout": 0.5})
+        self.sess = Session("test-session")
+
+    def _answer(self, skill_id, can_handle):
+        def pong(message):
+            self.bus.emit(message.reply("skill.converse.pong",
+                                        {"skill_id": skill_id, "can_handle": can_handle}))
+
+        self.bus.on(f"{skill_id}.converse.ping", pong)
+
+    def test_early_exit(self):
+        # highest priority skill answers, unresponsive lower priority skill is not waited for
+        self.sess.activate_skill("silent.skill")
+        self.sess.activate_skill("top.skill")
+        self._answer("top.skill", True)
+        message = Message("test", context={"session": self.sess.serialize()})
+        start = time.monotonic()
+        self.assertEqual(self.converse._collect_converse_skills(message), ["top.skill"])
+        self.assertLess(time.monotonic() - start, 0.1)
+
+    def test_priority_order(self):
+        self.sess.activate_skill("low.skill")
+        self.sess.activate_skill("no.skill")
+        self.sess.activate_skill("high.skill")
+        self._answer("low.skill", True)
+        self._answer("no.skill", False)
+        self._answer("high.skill", True)
+        message = Message("test", context={"session": self.sess.serialize()})
+        self.assertEqual(self.converse._collect_converse_skills(message),
+                         ["high.skill", "low.skill"])
+
+    def test_stats(self):
+        self.sess.activate_skill("top.skill")
+        self._answer("top.skill", True)
+        self.converse._collect_converse_skills(Message("test", context={"session": self.sess.serialize()}))
+        replies = []
+        self.bus.on("intent.service.converse.stats.reply", replies.append)
+        self.bus.emit(Message("intent.service.converse.stats.get"))
+        self.assertIn("top.skill", replies[0].data["skills"])
+
+    def test_unresponsive_skill(self):
+        self.converse.latencies.max_timeout = 0.2
+        self.sess.activate_skill("silent.skill")
+        message = Message("test", context={"session": self.sess.serialize()})
+        start = time.monotonic()
+        self.assertEqual(self.converse._collect_converse_skills(message), [])
+        self.assertGreaterEqual(time.monotonic() - start, 0.2)
+
+        # not pinged again while nothing changed
+        pings = []
+        self.bus.on("silent.skill.converse.ping", pings.append)
+        start = time.monotonic()
+        self.assertEqual(self.converse._collect_converse_skills(message), [])
+        self.assertLess(time.monotonic() - start, 0.1)
+        self.assertEqual(pings, [])
+
+        # re-activating the skill invalidates the cache
+        self.sess.activate_skill("silent.skill")
+        self._answer("silent.skill", True)
+        message = Message("test", context={"session": self.sess.serialize()})
+        self.assertEqual(self.converse._collect_converse_skills(message), ["silent.skill"])
+        self.assertEqual(len(pings), 1)
+
+        # a late answer removes the skill from the cache
+        self.converse.unresponsive.add(self.sess, "silent.skill")
+        self.bus.emit(Message("skill.converse.pong", {"skill_id": "silent.skill"},
+                              {"session": self.sess.serialize()}))
+        self.assertFalse(self.converse.unresponsive.is_unresponsive(self.sess, "silent.skill"))
+
+        # reloading the skill too
+        self.converse.unresponsive.add(self.sess, "silent.skill")
+        self.assertTrue(self.converse.unresponsive.is_unresponsive(self.sess, "silent.skill"))
+        self.bus.emit(Message("mycroft.skill.loaded", {"skill_id": "silent.skill"}))
+        self.assertFalse(self.converse.unresponsive.is_unresponsive(self.sess, "silent.skill"))
+
+
+    def test_slow_skill_not_cached(self):
+        # a fast skill with a tight adaptive deadline answers late, but within ping_timeout
+        for _ in range(10):
+            self.converse.latencies.record("slow.skill", 0.01)
+        self.assertEqual(self.converse.latencies.deadline("slow.skill"), 0.1)
+
+        def pong(message):
+            time.sleep(0.15)
+            self.bus.emit(message.reply("skill.converse.pong",
+                                        {"skill_id": "slow.skill", "can_handle": True}))
+
+        self.bus.on("slow.skill.converse.ping", lambda m: Thread(target=pong, args=(m,), daemon=True).start())
+        self.sess.activate_skill("slow.skill")
+        message = Message("test", context={"session": self.sess.serialize()})
+        self.assertEqual(self.converse._collect_converse_skills(message), [])
+        time.sleep(0.6)  # ping is closed once ping_timeout elapsed
+        self.assertFalse(self.converse.unresponsive.is_unresponsive(self.sess, "slow.skill"))
+        self.assertEqual(self.converse.latencies.stats()["slow.skill"]["timeouts"], 0)
+
+
+class TestConverseTimeout(TestCase):
+    def setUp(self):
+        self.converse = ConverseService(FakeBus(), config={"timeout": 300,
+                                                           "skill_timeouts": {"short.skill": 10}})
+
+    def test_expiry(self):
+        from ovos_bus_client.session import SessionManager
+        sess = SessionManager.default_session
+        now = time.time()
+        sess.active_skills = [["short.skill", now - 20], ["long.skill", now - 20], ["old.skill", now - 400]]
+        self.converse._check_converse_timeout(None)
+        self.assertEqual([s[0] for s in sess.active_skills], ["long.skill"])
+        self.assertEqual(self.converse.get_active_skills(), ["long.skill"])
+        # still callable on the class, like before
+        self.assertEqual(ConverseService.get_active_skills(), ["long.skill"])
+
+        # re-activation resets the expiry
+        sess.active_skills.insert(0, ["short.skill", time.time()])
+        self.converse._check_converse_timeout(None)
+        self.assertEqual(self.converse.get_active_skills(), ["short.skill", "long.skill"])
+        sess.active_skills = []
+
+    def test_live_config(self):
+        from ovos_bus_client.session import SessionManager
+        sess = SessionManager.default_session
+        sess.active_skills = [["long.skill", time.time() - 20]]
+        self.converse._check_converse_timeout(None)
+        self.assertEqual(self.converse.get_active_skills(), ["long.skill"])
+        # timeouts are read on every check, config reloads apply immediately
+        self.converse.config["skill_timeouts"]["long.skill"] = 10
+        self.converse._check_converse_timeout(None)
+        self.assertEqual(self.converse.get_active_skills(), [])
@@ -0,0 +1,72 @@
+import time
+from unittest import TestCase
+
+from ovos_bus_client.message import Message
+from ovos_utils.fakebus import FakeBus
+
+from ovos_core.intent_services.fallback_service import FallbackService, FallbackRange
+
+
+class TestFallbackCollector(TestCase):
+    def setUp(self):
+        self.bus = FakeBus()
+        self.fallback = FallbackService(self.bus, config={"ping_timeout": 0.5})
+        self.answers = {}
+
+        def pong(message):
+            for skill_id, can_handle in self.answers.items():
+                self.bus.emit(message.reply("ovos.skills.fallback.pong",
+                                            {"skill_id": skill_id, "can_handle": can_handle}))
+
+        self.bus.on("ovos.skills.fallback.ping", pong)
+
+    def _register(self, skill_id, priority):
+        self.bus.emit(Message("ovos.skills.fallback.register",
+                              {"skill_id": skill_id, "priority": priority}))
+
+    def test_early_exit(self):
+        self._register("best.skill", 10)
+        self._register("silent.skill", 50)  # never answers
+        self._register("out.of.range", 95)  # never answers, not waited for
+        self.answers = {"best.skill": True}
+        start = time.monotonic()
+        skills = self.fallback._collect_fallback_skills(Message("test"), FallbackRange(5, 90))
+        self.assertEqual(skills, ["best.skill"])
+        self.assertLess(time.monotonic() - start, 0.1)
+
+    def test_priority_order(self):
+        self._register("b.skill", 60)
+        self._register("a.skill", 20)
+        self._register("c.skill", 40)
+        self.answers = {"b.skill": True, "a.skill": True, "c.skill": False}
+        skills = self.fallback._collect_fallback_skills(Message("test"), FallbackRange(5, 90))
+        self.assertEqual(skills, ["a.skill", "b.skill"])
+
+    def test_timeout(self):
+        self._register("silent.skill", 50)
+        start = time.monotonic()
+        self.assertEqual(self.fallback._collect_fallback_skills(Message("test"), FallbackRange(5, 90)), [])
+        self.assertGreaterEqual(time.monotonic() - start, 0.5)
+
+    def test_single_ping_per_utterance(self):
+        pings = []
+        self.bus.on("ovos.skills.fallback.ping", pings.append)
+        self._register("high.skill", 3)
+        self._register("medium.skill", 50)
+        self._register("low.skill", 95)
+        self.answers = {"low.skill": True, "high.skill": False, "medium.skill": False}
+        message = Message("test", {"utterances": ["hello world"]})
+        self.assertIsNone(self.fallback.match_high(["hello world"], "en-US", message))
+        self.assertIsNone(self.fallback.match_medium(["hello world"], "en-US", message))
+        match = self.fallback.match_low(["hello world"], "en-US", message)
+        self.assertEqual(match.match_data["skill_id"], "low.skill")
+        self.assertEqual(len(pings), 1)
+        # shared by all tiers, not scoped to match_high's range
+        self.assertEqual(tuple(pings[0].data["range"]), (0, 101))
+        self.assertEqual(match.match_data["range"], (90, 101))
+        self.assertNotIn("range", message.data)
+
+        # cache expires once the utterance is handled
+        self.bus.emit(message.forward("ovos.utterance.handled"))
+        self.fallback.match_low(["hello world"], "en-US", message)
+        self.assertEqual(len(pings), 2)
@@ -0,0 +1,85 @@
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch, MagicMock
+
+from ovos_core.intent_services.metrics import IntentMetricsUploader
+
+
+class TestIntentMetricsUploader(TestCase):
+    def setUp(self):
+        self.spool_dir = tempfile.mkdtemp()
+        self.config = {"intent_urls": ["http://localhost:8000/intents"],
+                       "queue_size": 3, "batch_size": 100, "flush_interval": 100}
+
+    def test_not_configured(self):
+        uploader = IntentMetricsUploader(config={}, spool_dir=self.spool_dir)
+        uploader.submit("hello", "hello:intent", "en-US", {})
+        self.assertFalse(uploader.is_alive())
+        self.assertEqual(len(uploader._queue), 0)
+
+    @patch("ovos_core.intent_services.metrics.requests.Session")
+    def test_drop_oldest_and_pooled_session(self, session_cls):
+        uploader = IntentMetricsUploader(config=self.config, spool_dir=self.spool_dir)
+        for i in range(5):
+            uploader.submit(f"utt {i}", "intent", "en-US", {})
+        self.assertEqual([r["utterance"] for r in uploader._queue], ["utt 2", "utt 3", "utt 4"])
+        uploader.shutdown()
+        session_cls.assert_called_once()
+        self.assertEqual(session_cls.return_value.post.call_count, 3)
+
+    @patch("ovos_core.intent_services.metrics.requests.Session")
+    def test_spool_offline(self, session_cls):
+        session_cls.return_value.post.side_effect = ConnectionError("offline")
+        uploader = IntentMetricsUploader(config=self.config, spool_dir=self.spool_dir)
+        uploader._queue.extend([{"utterance": "a"}, {"utterance": "b"}])
+        uploader.flush()
+        self.assertEqual(len(uploader._read_spool(self.config["intent_urls"][0])), 2)
+
+        # back online, spooled records are sent first
+        session_cls.return_value.post.side_effect = None
+        uploader._queue.append({"utterance": "c"})
+        uploader.flush()
+        sent = [c.kwargs["data"]["utterance"] for c in session_cls.return_value.post.call_args_list[-3:]]
+        self.assertEqual(sent, ["a", "b", "c"])
+        self.assertEqual(uploader._read_spool(self.config["intent_urls"][0]), [])
+
+    @patch("ovos_core.intent_services.metrics.requests.Session")
+    def test_http_errors(self, session_cls):
+        url = self.config["intent_urls"][0]
+        uploader = IntentMetricsUploader(config={**self.config, "max_attempts": 2}, spool_dir=self.spool_dir)
+        post = session_cls.return_value.post
+
+        # rejected by the server, dropped instead of counted as delivered or retried forever
+        post.return_value = MagicMock(ok=False, status_code=400)
+        uploader._queue.extend([{"utterance": "a"}, {"utterance": "b"}])
+        uploader.flush()
+        self.assertEqual(post.call_count, 2)
+        self.assertEqual(uploader._read_spool(url), [])
+
+        # server error, spooled and retried
+        post.return_value = MagicMock(ok=False, status_code=503)
+        uploader._queue.extend([{"utterance": "c"}, {"utterance": "d"}])
+        uploader.flush()
+        self.assertEqual(uploader._read_spool(url), [{"utterance": "c", "_attempts": 1}, {"utterance": "d"}])
+        # the failing record does not block the spool forever
+        uploader.flush()
+        self.assertEqual(uploader._read_spool(url), [{"utterance": "d", "_attempts": 1}])
+
+        post.return_value = MagicMock(ok=True, status_code=200)
+        uploader.flush()
+        self.assertEqual(post.call_args.kwargs["data"], {"utterance": "d"})
+        self.assertEqual(uploader._read_spool(url), [])
+
+    @patch("ovos_core.intent_services.metrics.requests.Session")
+    def test_attempts_per_endpoint(self, session_cls):
+        urls = ["http://a/intents", "http://b/intents"]
+        uploader = IntentMetricsUploader(config={**self.config, "intent_urls": urls}, spool_dir=self.spool_dir)
+        session_cls.return_value.post.side_effect = lambda url, **kwargs: \
+            MagicMock(ok=url != urls[0], status_code=503 if url == urls[0] else 200)
+        record = {"utterance": "a"}
+        uploader._queue.append(record)
+        uploader.flush()
+        # failing at endpoint A does not count against endpoint B
+        self.assertEqual(uploader._read_spool(urls[0]), [{"utterance": "a", "_attempts": 1}])
+        self.assertEqual(uploader._read_spool(urls[1]), [])
+        self.assertEqual(record, {"utterance": "a"})
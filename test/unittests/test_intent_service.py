@@ -81,3 +81,152 @@ class TestLanguageExtraction(TestCase):
         msg = Message('test msg', data={'lang': 'sv-se'})
         self.assertEqual(get_message_lang(msg), 'sv-SE')
 
+
+
+class TestPipelineCache(TestCase):
+    def setUp(self):
+        self.intents = IntentService(FakeBus(), preload_pipelines=False)
+        self.plugin = mock.Mock()
+        self.intents.pipeline_plugins = {"ovos-mock-pipeline-plugin": self.plugin}
+
+    @staticmethod
+    def _session(pipeline):
+        sess = mock.Mock()
+        sess.pipeline = pipeline
+        return sess
+
+    def test_compiled_once(self):
+        sess = self._session(["ovos-mock-pipeline-plugin", "unknown_high"])
+        with mock.patch.object(self.intents, "get_pipeline_matcher",
+                               wraps=self.intents.get_pipeline_matcher) as m:
+            p1 = self.intents.get_pipeline(sess)
+            p2 = self.intents.get_pipeline(sess)
+            self.assertEqual(m.call_count, 2)  # once per pipeline id
+        self.assertEqual(p1, p2)
+        self.assertEqual(p1, [("ovos-mock-pipeline-plugin", self.plugin.match)])
+
+    @mock.patch("ovos_core.intent_services.service.OVOSPipelineFactory")
+    def test_reload_invalidates(self, factory):
+        sess = self._session(["ovos-mock-pipeline-plugin"])
+        self.assertEqual(self.intents.get_pipeline(sess)[0][1], self.plugin.match)
+        new_plugin = mock.Mock()
+        factory.get_installed_pipeline_ids.return_value = ["ovos-mock-pipeline-plugin"]
+        factory.load_plugin.return_value = new_plugin
+        self.intents.handle_reload_pipelines(Message("intent.service.pipelines.reload"))
+        self.assertEqual(self.intents.get_pipeline(sess)[0][1], new_plugin.match)
+
+    def test_cache_bounded(self):
+        self.intents.config = {"pipeline_cache_size": 2}
+        for i in range(5):
+            self.intents.get_pipeline(self._session(["ovos-mock-pipeline-plugin"] * (i + 1)))
+        self.assertEqual(len(self.intents._pipeline_cache), 2)
+
+
+class TestDisambiguateLang(TestCase):
+    def test_context_lang(self):
+        msg = Message("test", data={"lang": "en-US"},
+                      context={"valid_langs": ["en-us", "pt-pt"], "stt_lang": "pt-PT"})
+        self.assertEqual(IntentService.disambiguate_lang(msg), "pt-PT")
+        msg = Message("test", data={"lang": "en-US"},
+                      context={"valid_langs": ["en-us", "pt-pt"], "detected_lang": "de-DE"})
+        self.assertEqual(IntentService.disambiguate_lang(msg), "en-US")
+
+
+class TestSpeculativeMatching(TestCase):
+    def test_parallel_matchers(self):
+        def slow_miss(utterances, lang, message):
+            time.sleep(0.2)
+            return None
+
+        def slow_match(utterances, lang, message):
+            time.sleep(0.2)
+            return mock.Mock(skill_id=None, match_type="test:intent")
+
+        intents = IntentService(FakeBus(), preload_pipelines=False,
+                                config={"speculative_matching": True,
+                                        "speculative_pipelines": ["pipe-a", "pipe-b", "pipe-c"]})
+        intents._emit_match_message = mock.Mock()
+        intents.get_pipeline = mock.Mock(return_value=[("pipe-a", slow_miss),
+                                                       ("pipe-b", slow_match),
+                                                       ("pipe-c", slow_miss)])
+        msg = Message("recognizer_loop:utterance", {"utterances": ["hello world"], "lang": "en-US"})
+        start = time.monotonic()
+        match, _, _ = intents.handle_utterance(msg)
+        self.assertLess(time.monotonic() - start, 0.35)
+        self.assertEqual(match.match_type, "test:intent")
+        intents._emit_match_message.assert_called_once()
+        intents.shutdown()
+
+    def test_default_pipelines(self):
+        intents = IntentService(FakeBus(), preload_pipelines=False, config={})
+        self.assertTrue(intents._is_speculative("padatious_high"))
+        # adapt injects context into the session on a hit
+        self.assertFalse(intents._is_speculative("adapt_high"))
+        self.assertFalse(intents._is_speculative("converse"))
+        intents.shutdown()
+
+
+class TestMatchBatch(TestCase):
+    def test_batch(self):
+        def matcher(utterances, lang, message):
+            if "hello" in utterances[0]:
+                return mock.Mock(skill_id="hello.skill", match_type="hello:intent", match_data={})
+            return None
+
+        bus = FakeBus()
+        intents = IntentService(bus, preload_pipelines=False)
+        intents.get_pipeline = mock.Mock(return_value=[("mock", matcher)])
+        replies = []
+        bus.on("intent.service.intent.reply_batch", replies.append)
+        bus.emit(Message("intent.service.intent.get_batch",
+                         {"utterances": ["hello world", "goodbye"], "lang": "en-US"}))
+        matches = replies[0].data["matches"]
+        self.assertEqual(intents.get_pipeline.call_count, 1)
+        self.assertEqual(matches[0]["utterance"], "hello world")
+        self.assertEqual(matches[0]["intent"]["intent_name"], "hello:intent")
+        self.assertIsNone(matches[1]["intent"])
+        self.assertIn("time", matches[1])
+        intents.shutdown()
+
+
+class TestSessionDispatcher(TestCase):
+    def test_sharding(self):
+        from threading import Event
+        from ovos_core.intent_services.dispatcher import SessionDispatcher
+
+        dispatcher = SessionDispatcher(max_workers=4)
+        calls = []
+        done = Event()
+
+        def slow(n):
+            time.sleep(0.2)
+            calls.append(("slow", n))
+
+        def fast(n):
+            calls.append(("fast", n))
+            if n == 2:
+                done.set()
+
+        # the slow session does not block the other session
+        dispatcher.submit("slow-session", slow, 1)
+        dispatcher.submit("slow-session", slow, 2)
+        dispatcher.submit("fast-session", fast, 1)
+        dispatcher.submit("fast-session", fast, 2)
+        self.assertTrue(done.wait(0.15))
+        self.assertEqual(calls, [("fast", 1), ("fast", 2)])
+        # but tasks within a session run in order
+        time.sleep(0.5)
+        self.assertEqual([c for c in calls if c[0] == "slow"], [("slow", 1), ("slow", 2)])
+        self.assertEqual(dispatcher.pending, {})
+        dispatcher.shutdown()
+
+    def test_concurrent_sessions(self):
+        intents = IntentService(FakeBus(), preload_pipelines=False,
+                                config={"concurrent_sessions": True})
+        intents.handle_utterance = mock.Mock()
+        intents._dispatcher.submit = mock.Mock()
+        msg = Message("recognizer_loop:utterance", {"utterances": ["hello world"], "lang": "en-US"},
+                      {"session": {"session_id": "satellite-1"}})
+        intents.bus.emit(msg)
+        intents._dispatcher.submit.assert_called_once_with("satellite-1", intents.handle_utterance, mock.ANY)
+        intents.shutdown()
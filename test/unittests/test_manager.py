@@ -1,10 +1,27 @@
+import os
+import tempfile
+import time
 import unittest
+from threading import Event, Thread
 from os.path import join, dirname
 from unittest.mock import MagicMock, patch
 
 from ovos_bus_client.message import Message
+from ovos_utils.fakebus import FakeBus
 
 from ovos_core.skill_manager import SkillManager
+from ovos_core.skill_manifest import RecordingBus, SkillManifest
+from ovos_core.skill_stats import SkillStats
+from ovos_core.skill_worker import SkillWorker, SkillWorkerProcess
+
+
+def _wait_for(event):
+    event.wait()
+
+
+class _Skill:
+    def handler(self, message):
+        pass
 
 
 class TestSkillManager(unittest.TestCase):
@@ -26,11 +43,263 @@ class TestSkillManager(unittest.TestCase):
 
     @patch('ovos_core.skill_manager.find_skill_plugins', return_value={'mock_plugin': 'path/to/mock_plugin'})
     def test_load_plugin_skills(self, mock_find_skill_plugins):
+        self.skill_manager._plugin_index.invalidate()
         self.skill_manager._load_plugin_skill = MagicMock(return_value=True)
         self.skill_manager.load_plugin_skills(network=True, internet=True)
         self.assertTrue(self.skill_manager._load_plugin_skill.called)
         mock_find_skill_plugins.assert_called_once()
 
+    @patch('ovos_core.skill_manager.find_skill_plugins', return_value={'mock_plugin': 'path/to/mock_plugin'})
+    def test_plugin_index(self, mock_find_skill_plugins):
+        index = self.skill_manager._plugin_index
+        index.invalidate()
+        self.assertEqual(index.get(), {'mock_plugin': 'path/to/mock_plugin'})
+        self.assertEqual(index.get(), {'mock_plugin': 'path/to/mock_plugin'})
+        mock_find_skill_plugins.assert_called_once()
+        # SkillsStore installed something
+        self.skill_manager.handle_packages_changed(Message("ovos.pip.install.complete"))
+        index.get()
+        self.assertEqual(mock_find_skill_plugins.call_count, 2)
+        # site-packages changed
+        with patch.object(index, "_path_signature", return_value=(("/some/path", 1),)):
+            index.get()
+        self.assertEqual(mock_find_skill_plugins.call_count, 3)
+
+    @patch('ovos_core.skill_manager.find_skill_plugins',
+           return_value={'a.skill': 'A', 'b.skill': 'B', 'c.skill': 'C', 'critical.skill': 'D'})
+    def test_load_plugin_skills_parallel(self, mock_find_skill_plugins):
+        order = []
+
+        def load(skill_id, plugin):
+            time.sleep(0.1)
+            order.append(skill_id)
+            self.skill_manager.plugin_skills[skill_id] = MagicMock()
+            return True
+
+        self.skill_manager._plugin_index.invalidate()
+        self.skill_manager.config = {"skills": {"parallel_loading": True,
+                                                "load_workers": 4,
+                                                "priority_skills": ["critical.skill"],
+                                                "skill_dependencies": {"c.skill": ["a.skill"]}}}
+        self.skill_manager._load_plugin_skill = MagicMock(side_effect=load)
+        start = time.monotonic()
+        self.assertTrue(self.skill_manager.load_plugin_skills(network=True, internet=True))
+        # a, b and critical load concurrently, c waits for a
+        self.assertLess(time.monotonic() - start, 0.35)
+        self.assertEqual(order[-1], "c.skill")
+        self.assertEqual(self.skill_manager._load_plugin_skill.call_args_list[0][0][0], "critical.skill")
+        emitted = [c[0][0].msg_type for c in self.bus.emit.call_args_list]
+        self.assertEqual(emitted.count("mycroft.skills.priority_loaded"), 1)
+
+    def test_packages_watcher(self):
+        import tempfile
+        from threading import Event
+        from ovos_core.skill_manager import PackagesWatcher
+        changed = []
+        event = Event()
+
+        def callback(path):
+            changed.append(path)
+            event.set()
+
+        site_packages = tempfile.mkdtemp()
+        watcher = PackagesWatcher([site_packages], callback)
+        try:
+            os.makedirs(join(site_packages, "some_module"))
+            os.makedirs(join(site_packages, "ovos_skill_test-1.0.0.dist-info"))
+            self.assertTrue(event.wait(5))
+            self.assertTrue(changed[0].endswith("ovos_skill_test-1.0.0.dist-info"))
+            self.assertFalse(any(p.endswith("some_module") for p in changed))
+        finally:
+            watcher.shutdown()
+
+    def test_handle_packages_changed(self):
+        self.assertFalse(self.skill_manager._discovery_event.is_set())
+        self.skill_manager.handle_packages_changed(Message("ovos.skills.install.complete"))
+        self.assertTrue(self.skill_manager._discovery_event.is_set())
+
+    def test_incremental_training(self):
+        self.skill_manager._pending_training["loaded"].update({"b.skill", "a.skill"})
+        self.skill_manager._pending_training["unloaded"].add("old.skill")
+        self.bus.wait_for_response.return_value = Message("mycroft.skills.trained")
+        self.skill_manager._train_intents()
+        message = self.bus.wait_for_response.call_args[0][0]
+        self.assertEqual(message.msg_type, "mycroft.skills.train")
+        self.assertEqual(message.data, {"skill_ids": ["a.skill", "b.skill"],
+                                        "removed_skill_ids": ["old.skill"]})
+        # nothing changed, no training requested
+        self.bus.wait_for_response.reset_mock()
+        self.skill_manager._train_intents()
+        self.bus.wait_for_response.assert_not_called()
+
+    def test_lazy_skill(self):
+        manifest = SkillManifest("lazy.skill", "1.0", [
+            Message("register_intent", {"name": "lazy.skill:HelloIntent"}),
+            Message("padatious:register_intent", {"name": "lazy.skill:greet.intent"})])
+        with tempfile.TemporaryDirectory() as tmp, \
+                patch('ovos_core.skill_manifest.get_xdg_cache_save_path', return_value=tmp):
+            manifest.save()
+            self.assertIsNone(SkillManifest.load("lazy.skill", "2.0"))
+            manifest = SkillManifest.load("lazy.skill", "1.0")
+        self.assertEqual(manifest.intents, ["lazy.skill:HelloIntent", "lazy.skill:greet.intent"])
+        self.assertIsNone(manifest.fallback_priority)
+
+        self.skill_manager._register_lazy_skill("lazy.skill", "LazySkill", manifest)
+        emitted = [m[0][0].msg_type for m in self.bus.emit.call_args_list]
+        self.assertEqual(emitted, ["register_intent", "padatious:register_intent"])
+        self.assertIn("lazy.skill", self.skill_manager._pending_training["loaded"])
+
+        def load(skill_id, plugin):
+            self.skill_manager.plugin_skills[skill_id] = MagicMock()
+            return True
+
+        self.skill_manager._load_plugin_skill = MagicMock(side_effect=load)
+        self.bus.emit.reset_mock()
+        message = Message("lazy.skill:HelloIntent")
+        self.skill_manager._handle_lazy_trigger(message)
+        self.skill_manager._load_plugin_skill.assert_called_once_with("lazy.skill", "LazySkill")
+        self.bus.emit.assert_called_once_with(message)
+        # intents were registered from the manifest, no training needed
+        self.assertNotIn("lazy.skill", self.skill_manager._pending_training["loaded"])
+        # already instantiated
+        self.skill_manager._handle_lazy_trigger(message)
+        self.skill_manager._load_plugin_skill.assert_called_once()
+
+    def test_lazy_fallback_ping(self):
+        for skill_id, priority in (("high.skill", 3), ("low.skill", 95), ("loaded.skill", 50)):
+            manifest = SkillManifest(skill_id, "1.0", [
+                Message("ovos.skills.fallback.register", {"skill_id": skill_id, "priority": priority})])
+            self.skill_manager._register_lazy_skill(skill_id, skill_id, manifest, loaded=True)
+        self.skill_manager.plugin_skills["loaded.skill"] = MagicMock()
+
+        def load(skill_id, plugin):
+            self.skill_manager.plugin_skills[skill_id] = MagicMock()
+            return self.skill_manager.plugin_skills[skill_id]
+
+        self.skill_manager._load_plugin_skill = MagicMock(side_effect=load)
+        self.bus.emit.reset_mock()
+        message = Message("ovos.skills.fallback.ping", {"utterances": ["hello"], "range": (0, 90)})
+        self.skill_manager._handle_lazy_fallback_ping(message)
+        # only skills in range are loaded, only the new skill answers, the ping is not broadcast again
+        self.skill_manager._load_plugin_skill.assert_called_once_with("high.skill", "high.skill")
+        self.skill_manager.plugin_skills["high.skill"].instance._handle_fallback_ack.assert_called_once_with(message)
+        self.skill_manager.plugin_skills["loaded.skill"].instance._handle_fallback_ack.assert_not_called()
+        self.bus.emit.assert_not_called()
+
+    def test_recording_bus(self):
+        bus = RecordingBus(MagicMock())
+        for msg_type in ("register_intent", "ovos.common_play.register_keyword",
+                         "homescreen.register.app", "homescreen.register.examples", "speak"):
+            bus.emit(Message(msg_type, {"skill_id": "lazy.skill"}))
+        bus.recording = False
+        bus.emit(Message("register_vocab"))
+        self.assertEqual([m.msg_type for m in bus.messages],
+                         ["register_intent", "ovos.common_play.register_keyword",
+                          "homescreen.register.app", "homescreen.register.examples"])
+        self.assertEqual(bus._bus.emit.call_count, 6)  # everything is forwarded
+
+    def test_skill_stats(self):
+        stats = SkillStats({"enabled": True, "limits": {"threads": 1, "memory_mb": 0}})
+        bus = MagicMock()
+        skill_bus = stats.wrap_bus("test.skill", bus)
+        handler = MagicMock()
+        skill_bus.on("test.message", handler)
+        wrapper = bus.on.call_args[0][1]
+        wrapper(Message("test.message"))
+        wrapper(Message("test.message"))
+        handler.assert_called_with(Message("test.message"))
+
+        stats.add_skill("test.skill", TestSkillManager, 0.5)
+        done = Event()
+        threads = [Thread(target=done.wait, daemon=True) for _ in range(2)]
+        for t in threads:  # Event.wait is not from the skill module
+            t.start()
+        threads = [Thread(target=_wait_for, args=(done,), daemon=True) for _ in range(2)]
+        for t in threads:
+            t.start()
+        try:
+            sample = stats.sample()["test.skill"]
+            self.assertEqual(sample["load_time"], 0.5)
+            self.assertEqual(sample["handlers"]["test.message"]["calls"], 2)
+            self.assertEqual(len(sample["threads"]), 2)
+            self.assertNotIn("memory", sample)
+            self.assertEqual(list(stats.check_limits({"test.skill": sample})), ["test.skill"])
+        finally:
+            done.set()
+
+        # the skill unregisters the handler it registered, not the wrapper
+        skill_bus.remove("test.message", handler)
+        bus.remove.assert_called_once_with("test.message", wrapper)
+        # bound methods are a new object on every access
+        skill = _Skill()
+        skill_bus.on("test.bound", skill.handler)
+        bound_wrapper = bus.on.call_args[0][1]
+        skill_bus.remove("test.bound", skill.handler)
+        bus.remove.assert_called_with("test.bound", bound_wrapper)
+
+        # bus queries don't reset the cpu_percent window of the limits monitor
+        stats.sample("monitor")
+        stats.add_handler_time("test.skill", "test.message", 1.0)
+        self.assertGreater(stats.sample()["test.skill"]["cpu_percent"], 0)
+        self.assertGreater(stats.sample("monitor")["test.skill"]["cpu_percent"], 0)
+        self.assertEqual(stats.sample()["test.skill"]["cpu_percent"], 0)
+
+        stats.remove_skill("test.skill")
+        self.assertEqual(stats.sample(), {})
+
+    def test_isolated_skill(self):
+        self.skill_manager.config = {"skills": {"skill_workers": {"heavy": ["heavy.skill"]}},
+                                     "websocket": {}}
+        self.assertIsNone(self.skill_manager._get_skill_worker("other.skill"))
+        with patch('ovos_core.skill_manager.SkillWorkerProcess') as mock_worker, \
+                patch('ovos_core.skill_manager.create_daemon') as mock_daemon:
+            worker = mock_worker.return_value
+            worker.load.return_value = True
+            worker.skill_ids = {"heavy.skill"}
+            loader = self.skill_manager._load_plugin_skill("heavy.skill", "HeavySkill")
+            mock_worker.assert_called_once_with(self.bus, "heavy", load_timeout=60)
+            mock_daemon.assert_called_once_with(self.skill_manager._supervise_skill_workers)
+        worker.load.assert_called_once_with("heavy.skill")
+        self.assertIs(self.skill_manager.plugin_skills["heavy.skill"], loader)
+        self.assertTrue(loader.active and loader.loaded)
+        self.assertIn("heavy.skill", self.skill_manager._pending_training["loaded"])
+        self.bus.emit.assert_called_with(Message("mycroft.skill.loaded", {"skill_id": "heavy.skill"}))
+
+        self.skill_manager._unload_plugin_skill("heavy.skill")
+        worker.unload.assert_called_once_with("heavy.skill")
+        self.assertNotIn("heavy.skill", self.skill_manager.plugin_skills)
+        self.skill_manager.shutdown()
+        worker.stop.assert_called_once()
+
+    @patch('ovos_core.skill_worker.PluginSkillLoader')
+    @patch('ovos_core.skill_worker.find_skill_plugins', return_value={"heavy.skill": "HeavySkill"})
+    def test_skill_worker(self, mock_find_skill_plugins, mock_loader):
+        bus = FakeBus()
+        worker = SkillWorker(bus, "heavy")
+        mock_loader.return_value.load.return_value = True
+        response = bus.wait_for_response(Message("ovos.skills.worker.heavy.load", {"skill_id": "heavy.skill"}))
+        self.assertEqual(response.data, {"skill_id": "heavy.skill", "loaded": True})
+        mock_loader.assert_called_once_with(bus, "heavy.skill")
+        response = bus.wait_for_response(Message("ovos.skills.worker.heavy.load", {"skill_id": "missing.skill"}))
+        self.assertEqual(response.data, {"skill_id": "missing.skill", "loaded": False})
+
+        bus.emit(Message("ovos.skills.worker.heavy.unload", {"skill_id": "heavy.skill"}))
+        self.assertEqual(worker.skills, {})
+        mock_loader.return_value.instance.default_shutdown.assert_called_once()
+        # installed plugins are only scanned again for unknown skills
+        self.assertTrue(worker.load_skill("heavy.skill"))
+        self.assertEqual(mock_find_skill_plugins.call_count, 2)
+        worker.shutdown()
+
+    @patch('ovos_core.skill_worker.multiprocessing.get_context')
+    def test_skill_worker_process(self, mock_get_context):
+        worker = SkillWorkerProcess(FakeBus(), "heavy")
+        worker.start()
+        # skills in the worker may start processes of their own
+        self.assertNotIn("daemon", mock_get_context.return_value.Process.call_args.kwargs)
+        worker.stop()
+        mock_get_context.return_value.Process.return_value.terminate.assert_called_once()
+
     @patch('ovos_core.skill_manager.is_gui_connected', return_value=True)
     def test_handle_gui_connected(self, mock_is_gui_connected):
         self.skill_manager._allow_state_reloads = True
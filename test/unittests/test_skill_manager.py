@@ -99,6 +99,7 @@ class TestSkillManager(TestCase):
             'skillmanager.deactivate',
             'skillmanager.keep',
             'skillmanager.activate',
+            'skillmanager.stats',
             #'mycroft.skills.initialized',
             'mycroft.network.connected',
             'mycroft.internet.connected',
@@ -106,6 +107,9 @@ class TestSkillManager(TestCase):
             'mycroft.network.disconnected',
             'mycroft.internet.disconnected',
             'mycroft.gui.unavailable',
+            'ovos.skills.install.complete',
+            'ovos.pip.install.complete',
+            'ovos.pip.uninstall.complete',
             'mycroft.skills.is_alive',
             'mycroft.skills.is_ready',
             'mycroft.skills.all_loaded'
@@ -0,0 +1,75 @@
+import importlib
+import json
+import os
+import sys
+import tempfile
+import time
+from unittest import TestCase
+
+from ovos_core.startup_profiler import StartupProfiler, profile_dir_from_argv
+
+
+class TestStartupProfiler(TestCase):
+    def test_disabled(self):
+        profiler = StartupProfiler()
+        with profiler.span("noop"):
+            pass
+        self.assertEqual(profiler.events, [])
+
+    def test_timeline(self):
+        profiler = StartupProfiler()
+        with tempfile.TemporaryDirectory() as tmp:
+            with open(os.path.join(tmp, "profiled_test_module.py"), "w") as f:
+                f.write("VALUE = 1\n")
+            sys.path.insert(0, tmp)
+            profiler.start()
+            try:
+                with profiler.span("boot", skills=1):
+                    with profiler.span("test.skill", "skill"):
+                        module = importlib.import_module("profiled_test_module")
+            finally:
+                profiler.stop()
+                sys.path.remove(tmp)
+                sys.modules.pop("profiled_test_module", None)
+            # the real loader is restored after the module is executed
+            self.assertEqual(type(module.__loader__).__name__, "SourceFileLoader")
+            self.assertNotIn(profiler._import_timer, sys.meta_path)
+
+            names = [e["name"] for e in profiler.events]
+            self.assertEqual(names, ["profiled_test_module", "test.skill", "boot"])
+            report = profiler.report()
+            self.assertEqual(report["slowest_imports"][0]["name"], "profiled_test_module")
+            self.assertEqual([e["name"] for e in report["spans"]],
+                             ["boot", "test.skill", "profiled_test_module"])
+            self.assertEqual(set(report["categories"]), {"boot", "skill", "import"})
+            self.assertGreaterEqual(report["total"], report["spans"][0]["duration"])
+
+            paths = profiler.save(os.path.join(tmp, "profile"))
+            with open(paths[1]) as f:
+                trace = json.load(f)["traceEvents"]
+            spans = [e for e in trace if e["ph"] == "X"]
+            self.assertEqual(len(spans), 3)
+            boot = [e for e in spans if e["name"] == "boot"][0]
+            self.assertEqual(boot["args"], {"skills": 1})
+            self.assertTrue(all(boot["ts"] <= e["ts"] and e["ts"] + e["dur"] <= boot["ts"] + boot["dur"]
+                                for e in spans))
+            self.assertTrue(any(e["ph"] == "M" for e in trace))
+
+    def test_max_duration(self):
+        profiler = StartupProfiler()
+        profiler.start(max_duration=0.05)
+        import_timer = profiler._import_timer
+        time.sleep(0.2)
+        # never became ready, stopped on its own
+        self.assertFalse(profiler.enabled)
+        self.assertNotIn(import_timer, sys.meta_path)
+        total = profiler.report()["total"]
+        profiler.stop()
+        self.assertEqual(profiler.report()["total"], total)
+
+    def test_profile_dir_from_argv(self):
+        self.assertIsNone(profile_dir_from_argv(["ovos-core"]))
+        self.assertEqual(profile_dir_from_argv(["ovos-core", "--profile-startup"]), "")
+        self.assertEqual(profile_dir_from_argv(["ovos-core", "--profile-startup", "--disable-installer"]), "")
+        self.assertEqual(profile_dir_from_argv(["ovos-core", "--profile-startup", "/tmp/boot"]), "/tmp/boot")
+        self.assertEqual(profile_dir_from_argv(["ovos-core", "--profile-startup=/tmp/boot"]), "/tmp/boot")
@@ -0,0 +1,61 @@
+import time
+from unittest import TestCase
+
+from ovos_bus_client.message import Message
+from ovos_bus_client.session import Session
+from ovos_utils.fakebus import FakeBus
+
+from ovos_core.intent_services.stop_service import StopService
+
+
+class TestStopVocMatch(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.stop = StopService(FakeBus())
+
+    def test_exact(self):
+        self.assertTrue(self.stop.voc_match("Stop", "stop", lang="en-US", exact=True))
+        self.assertFalse(self.stop.voc_match("stop it now", "stop", lang="en-US", exact=True))
+
+    def test_contains(self):
+        self.assertTrue(self.stop.voc_match("please stop that now", "stop", lang="en-US"))
+        self.assertTrue(self.stop.voc_match("ok STOP EVERYTHING", "global_stop", lang="en-US"))
+        self.assertFalse(self.stop.voc_match("stopping", "stop", lang="en-US"))
+        self.assertFalse(self.stop.voc_match("what time is it", "stop", lang="en-US"))
+
+    def test_unknown(self):
+        self.assertFalse(self.stop.voc_match("stop", "not_a_voc", lang="en-US"))
+        self.assertFalse(self.stop.voc_match("stop", "stop", lang="xx-XX"))
+
+
+class TestStopPing(TestCase):
+    def setUp(self):
+        self.bus = FakeBus()
+        self.stop = StopService(self.bus)
+        self.sess = Session("test-stop-session")
+
+    def _answer(self, skill_id, can_handle):
+        def pong(message):
+            self.bus.emit(message.reply("skill.stop.pong",
+                                        {"skill_id": skill_id, "can_handle": can_handle}))
+
+        self.bus.on(f"{skill_id}.stop.ping", pong)
+
+    def test_collect(self):
+        self.sess.activate_skill("low.skill")
+        self.sess.activate_skill("no.skill")
+        self.sess.activate_skill("high.skill")
+        self._answer("low.skill", True)
+        self._answer("no.skill", False)
+        self._answer("high.skill", True)
+        message = Message("test", context={"session": self.sess.serialize()})
+        start = time.monotonic()
+        self.assertEqual(self.stop._collect_stop_skills(message), ["high.skill", "low.skill"])
+        self.assertLess(time.monotonic() - start, 0.1)
+        self.assertNotIn("ping_id", message.context)
+
+    def test_nobody_wants_to_stop(self):
+        self.sess.activate_skill("no.skill")
+        self._answer("no.skill", False)
+        message = Message("test", context={"session": self.sess.serialize()})
+        self.assertEqual(self.stop._collect_stop_skills(message), ["no.skill"])
@@ -0,0 +1,267 @@
+import time
+import unittest
+from copy import deepcopy
+from threading import Thread
+from unittest.mock import Mock
+
+from ovos_core.transformers import UtteranceTransformersService, MetadataTransformersService
+from ovos_plugin_manager.templates.transformers import UtteranceTransformer, MetadataTransformer
+
+from ovos_utils.fakebus import FakeBus
+
+
+class MockTransformer(UtteranceTransformer):
+
+    def __init__(self):
+        super().__init__("mock_transformer")
+
+    def transform(self, utterances, context=None):
+        return utterances + ["transformer"], {}
+
+
+class MockContextAdder(UtteranceTransformer):
+
+    def __init__(self):
+        super().__init__("mock_context_adder")
+
+    def transform(self, utterances, context=None):
+        return utterances, {"old_context": False,
+                            "new_context": True,
+                            "new_key": "test"}
+
+
+class MockSlowTransformer(UtteranceTransformer):
+
+    def __init__(self):
+        super().__init__("mock_slow_transformer")
+        self.delay = 0.2
+
+    def transform(self, utterances, context=None):
+        time.sleep(self.delay)
+        return utterances + ["slow"], {}
+
+
+class MockMetadataTransformer(MetadataTransformer):
+
+    def __init__(self, name, priority, reads, writes, value):
+        super().__init__(name, priority)
+        self.context_reads = reads
+        self.context_writes = writes
+        self.value = value
+
+    def transform(self, context=None):
+        time.sleep(0.1)
+        data = {k: self.value for k in self.context_writes}
+        for k in self.context_reads:
+            data[f"{self.name}_saw"] = context.get(k)
+        return data
+
+
+class TextTransformersTests(unittest.TestCase):
+    def test_utterance_transformer_service_load(self):
+        bus = FakeBus()
+        service = UtteranceTransformersService(bus)
+        self.assertIsInstance(service.config, dict)
+        self.assertEqual(service.bus, bus)
+        self.assertFalse(service.has_loaded)
+        self.assertIsInstance(service.loaded_plugins, dict)
+        for plugin in service.loaded_plugins:
+            self.assertIsInstance(service.loaded_plugins[plugin],
+                                  UtteranceTransformer)
+        self.assertIsInstance(service.plugins, list)
+        self.assertEqual(len(service.loaded_plugins), len(service.plugins))
+        service.shutdown()
+
+    def test_utterance_transformer_service_transform(self):
+        bus = FakeBus()
+        service = UtteranceTransformersService(bus)
+        service.loaded_plugins = {"mock_transformer": MockTransformer()}
+        utterances = ["test", "utterance"]
+        context = {"old_context": True,
+                   "new_context": False}
+        utterances, context = service.transform(utterances, context)
+        self.assertEqual(" ".join(utterances), "test utterance transformer")
+        self.assertEqual(context, {"old_context": True,
+                                   "new_context": False})
+
+        service.loaded_plugins["mock_context_adder"] = MockContextAdder()
+        utterances, context = service.transform(utterances, context)
+        self.assertEqual(utterances, ["test", "utterance",
+                                      "transformer", "transformer"])
+        self.assertEqual(context, {"old_context": False,
+                                   "new_context": True,
+                                   "new_key": "test"})
+        service.shutdown()
+
+    def test_utterance_transformer_service_priority(self):
+
+        utterances = ["test 1", "test one"]
+        lang = "en-US"
+
+        def mod_1_parse(utterances, lang):
+            utterances.append("mod 1 parsed")
+            return utterances, {"parser_context": "mod_1"}
+
+        def mod_2_parse(utterances, lang):
+            utterances.append("mod 2 parsed")
+            return utterances, {"parser_context": "mod_2"}
+
+        bus = FakeBus()
+        service = UtteranceTransformersService(bus)
+
+        mod_1 = Mock()
+        mod_1.priority = 2
+        mod_1.transform = mod_1_parse
+        mod_2 = Mock()
+        mod_2.priority = 1
+        mod_2.transform = mod_2_parse
+
+        service.loaded_plugins = \
+            {"test_mod_1": mod_1,
+             "test_mod_2": mod_2}
+
+        # Check transformers adding utterances
+        new_utterances, context = service.transform(deepcopy(utterances),
+                                                    {'lang': lang})
+        self.assertEqual(context["parser_context"], "mod_2")
+        self.assertNotEqual(new_utterances, utterances)
+        self.assertEqual(len(new_utterances),
+                         len(utterances) + 2)
+
+        # Check context change on priority swap
+        mod_2.priority = 100
+        service.invalidate_chain()
+        _, context = service.transform(deepcopy(utterances),
+                                       {'lang': lang})
+        self.assertEqual(context["parser_context"], "mod_1")
+
+    def test_utterance_transformer_service_chain(self):
+        bus = FakeBus()
+        service = UtteranceTransformersService(bus)
+        mod_1 = MockTransformer()
+        mod_1.priority = 2
+        mod_2 = MockContextAdder()
+        mod_2.priority = 1
+        service.loaded_plugins = {"mock_transformer": mod_1,
+                                  "mock_context_adder": mod_2}
+        chain = service.chain
+        self.assertEqual(chain.plugins, [mod_1, mod_2])
+        service.transform(["test"], {})
+        self.assertIs(service.chain, chain)  # not rebuilt if nothing changed
+        self.assertEqual(chain.stats["mock_transformer"]["calls"], 1)
+
+        mod_2.priority = 100
+        self.assertIs(service.chain, chain)  # priorities are not polled on every access
+        service.invalidate_chain()
+        self.assertIsNot(service.chain, chain)
+        self.assertEqual(service.plugins, [mod_2, mod_1])
+        self.assertEqual(service.chain.stats["mock_transformer"]["calls"], 1)  # stats kept
+
+        # loading and unloading plugins rebuilds the chain
+        del service.loaded_plugins["mock_transformer"]
+        self.assertEqual(service.plugins, [mod_2])
+        service.loaded_plugins["mock_transformer"] = mod_1
+        self.assertEqual(service.plugins, [mod_2, mod_1])
+
+        # stats are updated under a lock, sessions are transformed concurrently
+        threads = [Thread(target=lambda: [service.transform(["test"], {}) for _ in range(100)])
+                   for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(service.chain.stats["mock_transformer"]["calls"], 400)  # reset when unloaded
+        service.shutdown()
+
+    def test_utterance_transformer_service_batch_mismatch(self):
+        class BadBatchTransformer(MockTransformer):
+            def transform_batch(self, batch, contexts):
+                return [(utterances + ["batch"], {}) for utterances in batch][:1]
+
+        service = UtteranceTransformersService(FakeBus())
+        service.loaded_plugins = {"mock_transformer": BadBatchTransformer()}
+        items = service.transform_batch([["a"], ["b"], ["c"]], {})
+        # every utterance is kept, transformed one by one instead
+        self.assertEqual([utts for utts, _ in items],
+                         [["a", "transformer"], ["b", "transformer"], ["c", "transformer"]])
+        service.shutdown()
+
+    def test_utterance_transformer_service_circuit_breaker(self):
+        bus = FakeBus()
+        probes = []
+        bus.on("ovos.transformers.breaker.probe", probes.append)
+        service = UtteranceTransformersService(bus)
+        service.guard.config = {"mock_slow_transformer": {"timeout": 0.05,
+                                                          "max_timeouts": 2,
+                                                          "cooldown": 0.3}}
+        slow = MockSlowTransformer()
+        service.loaded_plugins = {"mock_slow_transformer": slow}
+
+        # result discarded when the deadline is exceeded
+        self.assertEqual(service.transform(["test"], {})[0], ["test"])
+        self.assertEqual(service.guard.state("mock_slow_transformer"), "closed")
+        service.transform(["test"], {})
+        self.assertEqual(service.guard.state("mock_slow_transformer"), "open")
+
+        # skipped while the circuit is open
+        start = time.monotonic()
+        service.transform(["test"], {})
+        self.assertLess(time.monotonic() - start, 0.05)
+        stats = service.chain.stats["mock_slow_transformer"]
+        self.assertEqual(stats["timeouts"], 2)
+        self.assertEqual(stats["skipped"], 1)
+
+        # half open probe after cooldown
+        time.sleep(0.3)
+        slow.delay = 0
+        self.assertEqual(service.transform(["test"], {})[0], ["test", "slow"])
+        self.assertEqual(service.guard.state("mock_slow_transformer"), "closed")
+        self.assertTrue(probes[0].data["success"])
+        service.shutdown()
+
+    def test_utterance_transformer_service_timeout_isolation(self):
+        class LateMutator(MockSlowTransformer):
+            def transform(self, utterances, context=None):
+                time.sleep(self.delay)
+                context["late"] = True
+                utterances.append("late")
+                return utterances, {}
+
+        service = UtteranceTransformersService(FakeBus())
+        service.guard.config = {"mock_slow_transformer": {"timeout": 0.05}}
+        service.loaded_plugins = {"mock_slow_transformer": LateMutator()}
+        utterances, context = ["test"], {"session": {"session_id": "default"}}
+        service.transform(utterances, context)
+        executor = service.guard._executor
+        service.transform(utterances, context)
+        self.assertIs(service.guard._executor, executor)  # one pool, not a thread per call
+        time.sleep(0.3)  # abandoned calls finished in the background
+        self.assertEqual(utterances, ["test"])
+        self.assertEqual(context, {"session": {"session_id": "default"}})
+        service.shutdown()
+
+    def test_metadata_transformer_service_parallel(self):
+        service = MetadataTransformersService(FakeBus())
+        service.config = {"parallel": True}
+        speaker = MockMetadataTransformer("speaker", 90, [], ["speaker"], "bob")
+        emotion = MockMetadataTransformer("emotion", 80, [], ["emotion"], "happy")
+        location = MockMetadataTransformer("location", 70, [], ["location"], "home")
+        greeter = MockMetadataTransformer("greeter", 60, ["speaker"], ["greeting"], "hi")
+        override = MockMetadataTransformer("override", 50, [], ["emotion"], "sad")
+        service.loaded_plugins = {p.name: p for p in [speaker, emotion, location, greeter, override]}
+
+        waves = service._get_waves(service.chain)
+        self.assertEqual([[n for n, _ in w] for w in waves],
+                         [["speaker", "emotion", "location", "override"], ["greeter"]])
+
+        start = time.monotonic()
+        context = service.transform({})
+        self.assertLess(time.monotonic() - start, 0.4)
+        self.assertEqual(context["greeter_saw"], "bob")
+        self.assertEqual(context["emotion"], "sad")  # lower priority applied last
+        self.assertEqual(context["location"], "home")
+        service.shutdown()
+
+
+if __name__ == "__main__":
+    unittest.main()